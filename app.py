@@ -1,23 +1,43 @@
+import json
+import os
+import tempfile
+import time
+
+_run_started = time.perf_counter()
+
 import streamlit as st
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from wordcloud import WordCloud
 
 from core.styles import inject_custom_css
-from core.models import load_models
-from core.logic import analyze_feedback
-from core.utils import (
+from core.ingest import iter_feedback_chunks, MissingColumnError
+from core.logic import analyze_feedback, analyze_feedback_batch, DEFAULT_BATCH_SIZE
+from core.charts import cached_charts
+from core.export import write_store
+from core.metrics import StageTimings, timed_iter
+from core.store import format_confidence, format_polarity
+from core.resources import (
     ensure_session_state,
+    get_models,
+    get_result_cache,
 )
 
 # Inject CSS and init session state
 inject_custom_css()
 ensure_session_state()
 
-# Load pre-trained models once
-models = load_models()
+# Models load lazily and warm up in the background (see core.resources)
+models = get_models()
+result_cache = get_result_cache()
+for message in models.errors:
+    st.error(message)
+_setup_seconds = time.perf_counter() - _run_started
+diagnostics = st.session_state.diagnostics
+
+def record_error(error: str):
+    # The message prefix keeps the label set small ("Error analyzing feedback", ...)
+    reason = error.split(':')[0].rstrip('.')
+    diagnostics.inc("errors_total", reason=reason)
+    return reason
 
 # Header
 st.markdown("""
@@ -38,32 +58,57 @@ with tab1:
             help="File should contain a 'feedback' or 'text' column",
             label_visibility="collapsed"
         )
-        if uploaded_file is not None:
+        # The uploader keeps its file across reruns; analyze each upload once and
+        # replay its report afterwards, so clicks elsewhere don't re-stream it
+        if uploaded_file is not None and st.session_state.get('upload_id') != uploaded_file.file_id:
+            report = []
             try:
-                if uploaded_file.name.endswith('.csv'):
-                    df = pd.read_csv(uploaded_file)
-                else:
-                    df = pd.read_excel(uploaded_file)
-                
-                if 'feedback' not in df.columns and 'text' not in df.columns:
-                    st.error("Error: File must contain a 'feedback' or 'text' column")
-                else:
-                    feedback_col = 'feedback' if 'feedback' in df.columns else 'text'
-                    with st.spinner(f"Analyzing {len(df)} feedback entries..."):
-                        new_reviews = []
-                        for feedback in df[feedback_col]:
-                            if pd.notna(feedback) and isinstance(feedback, str):
-                                result, error = analyze_feedback(str(feedback), models=models)
-                                if result:
-                                    new_reviews.append(result)
-                                elif error:
-                                    # Non-blocking: log or show first error
-                                    pass
-                        if new_reviews:
-                            st.session_state.reviews.extend(new_reviews)
-                            st.success(f"Successfully analyzed {len(new_reviews)} new feedback entries!")
+                progress = st.progress(0.0, text="Reading file...")
+                rows_read = 0
+                analyzed = 0
+                started = time.perf_counter()
+                timings = StageTimings()
+                skipped = {}
+                chunks = iter_feedback_chunks(uploaded_file, uploaded_file.name)
+                for texts, chunk_rows, fraction in timed_iter(chunks, timings, "read_file"):
+                    new_reviews = []
+                    for result, error in analyze_feedback_batch(texts, models=models,
+                                                                batch_size=DEFAULT_BATCH_SIZE,
+                                                                cache=result_cache,
+                                                                session=st.session_state,
+                                                                timings=timings,
+                                                                near_duplicates=st.session_state.near_duplicates,
+                                                                reuse_clusters=st.session_state.get('reuse_clusters', False)):
+                        if result:
+                            new_reviews.append(result)
+                        elif error:
+                            reason = record_error(error)
+                            skipped[reason] = skipped.get(reason, 0) + 1
+                    st.session_state.reviews.extend(new_reviews)
+                    rows_read += chunk_rows
+                    analyzed += len(new_reviews)
+                    rate = rows_read / max(time.perf_counter() - started, 1e-9)
+                    progress.progress(fraction, text=f"Analyzed {rows_read:,} rows ({rate:,.0f} rows/sec)")
+                progress.empty()
+                diagnostics.inc("rows_total", rows_read)
+                diagnostics.inc("reviews_analyzed_total", analyzed)
+                diagnostics.set("rows_per_second", rate if rows_read else 0.0)
+                diagnostics.record_timings(timings)
+                if analyzed:
+                    report.append(('success', f"Successfully analyzed {analyzed} new feedback entries!"))
+                    report.append(('caption', f"Stage timings: {timings.summary()}"))
+                if skipped:
+                    report.append(('warning', "Skipped " + ", ".join(f"{count} × {reason}"
+                                                                     for reason, count in skipped.items())))
+            except MissingColumnError as e:
+                report.append(('error', f"Error: {str(e)}"))
             except Exception as e:
-                st.error(f"Error processing file: {str(e)}")
+                report.append(('error', f"Error processing file: {str(e)}"))
+            st.session_state.upload_id = uploaded_file.file_id
+            st.session_state.upload_report = report
+        if uploaded_file is not None:
+            for kind, message in st.session_state.get('upload_report', []):
+                getattr(st, kind)(message)
 
     st.markdown("### ✍️ Single Feedback Analysis")
     
@@ -86,11 +131,20 @@ with tab1:
     with col1:
         if st.button("Analyze Feedback"):
             if feedback.strip():
-                result, error = analyze_feedback(feedback, selected_lang, models)
+                timings = StageTimings()
+                result, error = analyze_feedback(feedback, selected_lang, models, cache=result_cache,
+                                                 session=st.session_state,
+                                                 near_duplicates=st.session_state.near_duplicates,
+                                                 reuse_clusters=st.session_state.get('reuse_clusters', False),
+                                                 timings=timings)
+                diagnostics.inc("rows_total")
+                diagnostics.record_timings(timings)
                 
                 if error:
+                    record_error(error)
                     st.error(error)
                 elif result:
+                    diagnostics.inc("reviews_analyzed_total")
                     st.session_state.reviews.append(result)
                     
                     with st.container():
@@ -109,7 +163,7 @@ with tab1:
                             </div>
                             <div class="result-item">
                                 <span class="result-label">Confidence:</span>
-                                <span class="confidence-value">{result['confidence']}</span>
+                                <span class="confidence-value">{format_confidence(result['confidence'])}</span>
                             </div>
                             <div class="result-item">
                                 <span class="result-label">Sentiment:</span>
@@ -117,7 +171,7 @@ with tab1:
                             </div>
                             <div class="result-item">
                                 <span class="result-label">Polarity:</span>
-                                <span class="polarity-value">{result['polarity']}</span>
+                                <span class="polarity-value">{format_polarity(result['polarity'])}</span>
                             </div>
                         </div>
                         """, unsafe_allow_html=True)
@@ -157,12 +211,29 @@ with tab2:
         with col3:
             filter_lang = st.selectbox("Filter by language", ["All", "English", "Hindi", "Telugu"], index=0)
         
-        filtered_reviews = [r for r in st.session_state.reviews 
-                          if (filter_class == "All" or r['classification'] == filter_class) and
-                          (filter_sent == "All" or r['sentiment'] == filter_sent) and
-                          (filter_lang == "All" or r['language'] == filter_lang)]
+        store = st.session_state.reviews
+        filtered_indices = store.select(classification=filter_class, sentiment=filter_sent, language=filter_lang)
+        
+        page_col1, page_col2 = st.columns([1, 3])
+        with page_col1:
+            page_size = st.selectbox("Reviews per page", [25, 50, 100], index=0)
+        page_count = max(1, -(-len(filtered_indices) // page_size))
+        with page_col2:
+            page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, step=1)
+        first = (page - 1) * page_size
+        page_indices = filtered_indices[first:first + page_size]
+        if len(filtered_indices):
+            st.caption(f"Showing {first + 1}–{first + len(page_indices)} of {len(filtered_indices)} matching reviews")
+        else:
+            st.caption("No reviews match these filters")
         
-        for review in filtered_reviews:
+        cluster_sizes = st.session_state.near_duplicates.sizes
+        for review in store.rows(page_indices):
+            # Only label reviews that actually have near-duplicates
+            cluster_id = review['cluster_id']
+            cluster_label = (f"Cluster #{cluster_id} ({cluster_sizes[cluster_id]} reviews) · "
+                             if cluster_id is not None and cluster_id < len(cluster_sizes)
+                             and cluster_sizes[cluster_id] > 1 else "")
             st.markdown(f"""
             <div class='review-item'>
                 <div style='display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;'>
@@ -170,28 +241,38 @@ with tab2:
                         <span class="{'genuine' if review['classification'] == 'GENUINE' else 'fake'}">
                             {review['classification']}
                         </span>
-                        <span class="confidence-value"> ({review['confidence']})</span>
+                        <span class="confidence-value"> ({format_confidence(review['confidence'])})</span>
                         <span class="language-value" style='margin-left: 1rem;'>{review['language']}</span>
                     </div>
-                    <small style='color: #6b7280;'>{review['timestamp']}</small>
+                    <small style='color: #6b7280;'>{cluster_label}{review['timestamp']}</small>
                 </div>
                 <div style='margin-bottom: 0.5rem;'>{review['text']}</div>
                 <div>
                     <span class="{'positive' if review['sentiment'] == 'POSITIVE' else 'negative' if review['sentiment'] == 'NEGATIVE' else 'neutral'}">
                         {review['sentiment']}
                     </span>
-                    <span class="polarity-value"> (Polarity: {review['polarity']})</span>
+                    <span class="polarity-value"> (Polarity: {format_polarity(review['polarity'])})</span>
                 </div>
             </div>
             """, unsafe_allow_html=True)
         
-        csv = pd.DataFrame(filtered_reviews).to_csv(index=False)
-        st.download_button(
-            label="📥 Download Filtered Results",
-            data=csv,
-            file_name='feedback_analysis.csv',
-            mime='text/csv'
-        )
+        # The CSV is only written on request, streamed from the store to a temporary
+        # file in chunks. The download is offered on that run only, so later reruns
+        # never read it again, and the file is deleted once handed to Streamlit.
+        if st.button("Prepare CSV download", disabled=not len(filtered_indices)):
+            fd, export_path = tempfile.mkstemp(suffix='.csv')
+            os.close(fd)
+            try:
+                write_store(store, export_path, filtered_indices, 'csv')
+                with open(export_path, 'rb') as export_file:
+                    st.download_button(
+                        label="📥 Download Filtered Results",
+                        data=export_file,
+                        file_name='feedback_analysis.csv',
+                        mime='text/csv'
+                    )
+            finally:
+                os.remove(export_path)
     else:
         st.info("No reviews analyzed yet. Submit feedback in the 'Analyze Feedback' tab.")
 
@@ -199,72 +280,49 @@ with tab3:
     if st.session_state.reviews:
         st.markdown("### 📊 Advanced Insights")
         
-        df = pd.DataFrame(st.session_state.reviews)
+        # Running aggregates: metric cost does not grow with the number of reviews
+        stats = st.session_state.reviews.stats
+        # Charts are redrawn only when the reviews change, not on every rerun
+        charts = cached_charts(st.session_state.chart_cache, st.session_state.reviews)
         
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Total Reviews", len(df))
+            st.metric("Total Reviews", stats.total)
         with col2:
-            genuine_pct = len(df[df['classification'] == 'GENUINE']) / len(df)
-            st.metric("Genuine Reviews", f"{genuine_pct:.0%}")
+            st.metric("Genuine Reviews", f"{stats.share('classification', 'GENUINE'):.0%}")
         with col3:
-            fake_pct = len(df[df['classification'] == 'FAKE']) / len(df)
-            st.metric("Fake Reviews", f"{fake_pct:.0%}")
+            st.metric("Fake Reviews", f"{stats.share('classification', 'FAKE'):.0%}")
         with col4:
-            lang_counts = df['language'].value_counts(normalize=True)
-            st.metric("Hindi Reviews", f"{lang_counts.get('Hindi', 0):.0%}")
+            st.metric("Hindi Reviews", f"{stats.share('language', 'Hindi'):.0%}")
         
         st.markdown("#### Distributions")
         fig_col1, fig_col2, fig_col3 = st.columns(3)
         
         with fig_col1:
             st.markdown("Authenticity")
-            fig, ax = plt.subplots()
-            sns.countplot(data=df, x='classification', palette=['#2a9d8f', '#e63946'])
-            plt.xlabel("")
-            plt.ylabel("Count")
-            st.pyplot(fig)
+            st.image(charts['authenticity'], use_column_width=True)
         
         with fig_col2:
             st.markdown("Sentiment")
-            fig, ax = plt.subplots()
-            sns.countplot(data=df, x='sentiment', palette=['#2a9d8f', '#e63946', '#3a86ff'], order=['POSITIVE', 'NEGATIVE', 'NEUTRAL'])
-            plt.xlabel("")
-            plt.ylabel("Count")
-            st.pyplot(fig)
+            st.image(charts['sentiment'], use_column_width=True)
         
         with fig_col3:
             st.markdown("Language")
-            fig, ax = plt.subplots()
-            sns.countplot(data=df, x='language', palette=['#4f46e5', '#e63946', '#2a9d8f'])
-            plt.xlabel("")
-            plt.ylabel("Count")
-            st.pyplot(fig)
+            st.image(charts['language'], use_column_width=True)
         
         st.markdown("#### Model Accuracy Analysis")
         accuracy_col1, accuracy_col2 = st.columns(2)
         
         with accuracy_col1:
             st.markdown("**Confidence Distribution**")
-            fig, ax = plt.subplots()
-            df['confidence_num'] = df['confidence'].str.rstrip('%').astype('float') / 100.0
-            sns.histplot(data=df, x='confidence_num', bins=10, kde=True, color='#4f46e5')
-            plt.xlabel("Confidence Level")
-            plt.ylabel("Count")
-            st.pyplot(fig)
+            st.image(charts['confidence'], use_column_width=True)
             
         with accuracy_col2:
             st.markdown("**Accuracy Metrics**")
-            avg_conf_genuine = df[df['classification'] == 'GENUINE']['confidence_num'].mean()
-            avg_conf_fake = df[df['classification'] == 'FAKE']['confidence_num'].mean()
-            
-            def safe_ratio(a, b):
-                return a/b if b else np.nan
-
-            genuine_total = len(df[df['classification'] == 'GENUINE'])
-            fake_total = len(df[df['classification'] == 'FAKE'])
-            genuine_pos = safe_ratio(len(df[(df['classification'] == 'GENUINE') & (df['sentiment'] == 'POSITIVE')]), genuine_total)
-            fake_neg = safe_ratio(len(df[(df['classification'] == 'FAKE') & (df['sentiment'] == 'NEGATIVE')]), fake_total)
+            avg_conf_genuine = stats.mean_confidence('GENUINE')
+            avg_conf_fake = stats.mean_confidence('FAKE')
+            genuine_pos = stats.sentiment_share('GENUINE', 'POSITIVE')
+            fake_neg = stats.sentiment_share('FAKE', 'NEGATIVE')
             
             st.metric("Average Confidence (Genuine)", f"{avg_conf_genuine:.0%}" if not np.isnan(avg_conf_genuine) else "N/A")
             st.metric("Average Confidence (Fake)", f"{avg_conf_fake:.0%}" if not np.isnan(avg_conf_fake) else "N/A")
@@ -275,24 +333,14 @@ with tab3:
         tab_k1, tab_k2 = st.tabs(["Genuine Reviews", "Fake Reviews"])
         
         with tab_k1:
-            genuine_text = " ".join(df[df['classification'] == 'GENUINE']['text'])
-            if genuine_text:
-                wordcloud = WordCloud(width=800, height=400, background_color='white').generate(genuine_text)
-                fig, ax = plt.subplots()
-                ax.imshow(wordcloud, interpolation='bilinear')
-                ax.axis('off')
-                st.pyplot(fig)
+            if charts['cloud_GENUINE'] is not None:
+                st.image(charts['cloud_GENUINE'], use_column_width=True)
             else:
                 st.info("No genuine reviews available")
         
         with tab_k2:
-            fake_text = " ".join(df[df['classification'] == 'FAKE']['text'])
-            if fake_text:
-                wordcloud = WordCloud(width=800, height=400, background_color='white').generate(fake_text)
-                fig, ax = plt.subplots()
-                ax.imshow(wordcloud, interpolation='bilinear')
-                ax.axis('off')
-                st.pyplot(fig)
+            if charts['cloud_FAKE'] is not None:
+                st.image(charts['cloud_FAKE'], use_column_width=True)
             else:
                 st.info("No fake reviews available")
     else:
@@ -300,8 +348,50 @@ with tab3:
 
 with st.sidebar:
     st.markdown("### System Controls")
+    st.checkbox(
+        "Reuse results for near-duplicates",
+        key='reuse_clusters',
+        help="Copy the verdict of the first review in a near-duplicate cluster instead of running the models again"
+    )
     if st.button("🚨 Reset All Data"):
-        st.session_state.reviews = []
+        st.session_state.reviews.clear()
         st.session_state.processed_hashes = set()
+        st.session_state.near_duplicates.clear()
+        st.session_state.diagnostics.reset()
+        st.session_state.pop('upload_report', None)
         st.success("All data has been reset!")
         st.rerun()
+
+    with st.expander("⏱️ Startup timings", expanded=False):
+        st.markdown(f"- Imports & setup: {_setup_seconds:.2f}s")
+        for key, label in (('en', "English model"), ('multi', "Multilingual model")):
+            if key in models.load_seconds:
+                status = "failed" if models[key] is None else "loaded"
+                st.markdown(f"- {label}: {status} in {models.load_seconds[key]:.1f}s")
+            else:
+                st.markdown(f"- {label}: loading...")
+        st.markdown(f"- Page render: {time.perf_counter() - _run_started:.2f}s")
+
+    with st.expander("🩺 Diagnostics", expanded=False):
+        if result_cache is not None:
+            diagnostics.set("result_cache_hits", result_cache.hits)
+            diagnostics.set("result_cache_misses", result_cache.misses)
+        diagnostics.set("reviews_stored", len(st.session_state.reviews))
+        st.markdown(f"- Rows processed: {diagnostics.counter('rows_total'):,.0f}")
+        st.markdown(f"- Last batch: {diagnostics.gauges.get(('rows_per_second', ()), 0.0):,.0f} rows/sec")
+        if result_cache is not None:
+            lookups = result_cache.hits + result_cache.misses
+            st.markdown(f"- Cache hits: {result_cache.hits:,} of {lookups:,}")
+        for labels, count in diagnostics.labelled(diagnostics.counters, "errors_total").items():
+            st.markdown(f"- Errors ({dict(labels)['reason']}): {count:,.0f}")
+        stage_seconds = diagnostics.labelled(diagnostics.counters, "stage_seconds_total")
+        stage_items = diagnostics.labelled(diagnostics.counters, "stage_items_total")
+        if stage_seconds:
+            st.markdown("**Per-stage latency**")
+            for labels, seconds in sorted(stage_seconds.items(), key=lambda kv: -kv[1]):
+                per_item = seconds / max(stage_items.get(labels, 0), 1) * 1000
+                st.markdown(f"- {dict(labels)['stage']}: {seconds:.2f}s total, {per_item:.2f} ms/row")
+        st.download_button("Export (Prometheus)", diagnostics.to_prometheus(),
+                           file_name="metrics.prom", mime="text/plain")
+        st.download_button("Export (JSON)", json.dumps(diagnostics.as_dict(), indent=2),
+                           file_name="metrics.json", mime="application/json")
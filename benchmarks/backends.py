@@ -0,0 +1,63 @@
+"""Accuracy parity and speed of the inference backends against fp32 PyTorch.
+
+    python -m benchmarks.backends --rows 2000 --backends torch torch-int8 onnx
+
+Every backend analyzes the same synthetic corpus. Agreement is the share of
+rows whose classification and sentiment match the fp32 results. The command
+exits non-zero if any backend falls below --min-agreement.
+"""
+import argparse
+import sys
+import time
+
+from benchmarks.corpus import synthetic_corpus
+from core.logic import analyze_texts
+from core.models import BACKENDS, load_models
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--min-agreement", type=float, default=0.98)
+    args = parser.parse_args(argv)
+
+    texts = synthetic_corpus(args.rows)
+    backends = ['torch'] + [backend for backend in args.backends if backend != 'torch']
+    reference = None
+    failed = False
+    print(f"{'backend':>10} {'load s':>7} {'rows/sec':>9} {'p50 ms':>7} {'agree':>7} {'max dconf':>9}")
+    for backend in backends:
+        started = time.perf_counter()
+        models = load_models(backend=backend)
+        load_seconds = time.perf_counter() - started
+
+        # Single-row latency on a small sample, then batch throughput on everything
+        latencies = []
+        for text in texts[:50]:
+            started = time.perf_counter()
+            analyze_texts([text], 'auto', models, 1)
+            latencies.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        outcomes = analyze_texts(texts, 'auto', models, args.batch_size)
+        rate = len(texts) / (time.perf_counter() - started)
+        results = [result for result, _ in outcomes]
+
+        if reference is None:
+            reference = results
+            agreement, drift = 1.0, 0.0
+        else:
+            pairs = [(a, b) for a, b in zip(reference, results) if a and b]
+            agreement = sum(
+                a['classification'] == b['classification'] and a['sentiment'] == b['sentiment']
+                for a, b in pairs
+            ) / max(len(pairs), 1)
+            drift = max((abs(a['confidence'] - b['confidence']) for a, b in pairs), default=0.0)
+            failed = failed or agreement < args.min_agreement
+        p50 = sorted(latencies)[len(latencies) // 2] * 1000
+        print(f"{backend:>10} {load_seconds:>7.1f} {rate:>9.1f} {p50:>7.1f} {agreement:>7.1%} {drift:>9.2f}")
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Cold-start timing report, one fresh interpreter per measurement.
+
+    python -m benchmarks.cold_start --output cold_start.json
+
+Record the JSON for each release to track startup regressions over time.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+# Each snippet runs in a new process so nothing is already imported or cached
+_PROBES = {
+    "import_core": "import core.logic, core.models, core.utils, core.cache",
+    "import_ui": "import streamlit, pandas, numpy",
+    "import_plotting": "import matplotlib.pyplot, seaborn, wordcloud",
+    "import_torch_transformers": "import torch, transformers",
+    "load_model_en": "from core.models import LazyModels; LazyModels()['en']",
+    "load_model_multi": "from core.models import LazyModels; LazyModels()['multi']",
+    "first_analysis": (
+        "from core.models import LazyModels; from core.logic import analyze_feedback; "
+        "analyze_feedback('The product arrived on time', 'auto', LazyModels())"
+    ),
+}
+
+def _time_probe(code: str) -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+    return time.perf_counter() - started
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except Exception:
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per probe; the minimum is reported")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    baseline = min(_time_probe("pass") for _ in range(args.repeat))
+    report = {
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "interpreter_seconds": baseline,
+        "probes": {},
+    }
+    for name, code in _PROBES.items():
+        try:
+            seconds = min(_time_probe(code) for _ in range(args.repeat)) - baseline
+        except subprocess.CalledProcessError as e:
+            report["probes"][name] = {"error": e.stderr.decode(errors="replace").strip().splitlines()[-1:]}
+            print(f"{name:>28}  failed")
+            continue
+        report["probes"][name] = {"seconds": seconds}
+        print(f"{name:>28}  {seconds:6.2f}s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
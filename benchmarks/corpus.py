@@ -0,0 +1,37 @@
+import random
+
+# Small phrase banks; reviews are random combinations so that hashes differ
+# and lengths vary the way real exports do.
+_PHRASES = {
+    'en': [
+        "The product arrived on time", "Absolutely the best purchase I have ever made",
+        "Battery life is much shorter than advertised", "Customer support never replied to my emails",
+        "Great value for money", "The fabric feels cheap and started tearing after a week",
+        "Five stars, highly recommended to everyone", "Packaging was damaged but the item works",
+        "I would not buy this again", "Works exactly as described in the listing",
+    ],
+    'hi': [
+        "उत्पाद समय पर पहुंचा", "यह अब तक की सबसे अच्छी खरीदारी है", "बैटरी जल्दी खत्म हो जाती है",
+        "ग्राहक सेवा ने कोई जवाब नहीं दिया", "पैसे के हिसाब से बढ़िया है", "कपड़ा बहुत खराब गुणवत्ता का है",
+        "सभी को इसकी सलाह दूंगा", "पैकेजिंग टूटी हुई थी",
+    ],
+    'te': [
+        "ఉత్పత్తి సమయానికి వచ్చింది", "ఇది చాలా మంచి కొనుగోలు", "బ్యాటరీ త్వరగా అయిపోతుంది",
+        "కస్టమర్ సపోర్ట్ స్పందించలేదు", "డబ్బుకు తగిన విలువ", "నాణ్యత చాలా తక్కువగా ఉంది",
+        "అందరికీ సిఫార్సు చేస్తాను", "ప్యాకేజింగ్ దెబ్బతింది",
+    ],
+}
+
+DEFAULT_MIX = {'en': 0.6, 'hi': 0.2, 'te': 0.2}
+
+def synthetic_corpus(size: int, mix: dict = None, max_sentences: int = 6, seed: int = 0) -> list:
+    """Reproducible English/Hindi/Telugu reviews, `size` of them, mixed per `mix`."""
+    rng = random.Random(seed)
+    mix = mix or DEFAULT_MIX
+    languages, weights = zip(*mix.items())
+    corpus = []
+    for n in range(size):
+        language = rng.choices(languages, weights)[0]
+        sentences = rng.choices(_PHRASES[language], k=rng.randint(1, max_sentences))
+        corpus.append(". ".join(sentences) + f". #{n}")
+    return corpus
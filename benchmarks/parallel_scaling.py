@@ -0,0 +1,37 @@
+"""Throughput of ParallelAnalyzer as the worker count grows.
+
+    python -m benchmarks.parallel_scaling --rows 20000 --workers 1 2 4 8 16 32
+"""
+import argparse
+import os
+import time
+
+from benchmarks.corpus import synthetic_corpus
+from core.parallel import ParallelAnalyzer
+from core.session import AnalysisSession
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--threads-per-worker", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args(argv)
+
+    texts = synthetic_corpus(args.rows)
+    print(f"{args.rows} rows, {os.cpu_count()} cores")
+    print(f"{'workers':>7} {'threads':>7} {'seconds':>9} {'rows/sec':>9} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        with ParallelAnalyzer(workers, args.threads_per_worker, args.batch_size) as analyzer:
+            analyzer.warm_up()  # model loading is not part of throughput
+            started = time.perf_counter()
+            outcomes = analyzer.analyze_batch(texts, session=AnalysisSession())
+            elapsed = time.perf_counter() - started
+        assert all(result for result, _ in outcomes), "some rows failed to analyze"
+        rate = args.rows / elapsed
+        baseline = baseline or rate
+        print(f"{workers:>7} {analyzer.threads_per_worker:>7} {elapsed:>9.2f} {rate:>9.1f} {rate / baseline:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Output parity checks between the analysis paths, on stand-in models.
+
+    python -m benchmarks.parity --rows 300
+
+Checks that the batched path returns exactly what the per-row path does,
+that results served from the result cache equal freshly computed ones,
+and that long reviews get the same windowed verdict in both paths. Runs
+offline in seconds; exits non-zero on any mismatch.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+from benchmarks.corpus import synthetic_corpus
+from benchmarks.pipeline import StandInPipeline
+from core import chunking
+from core.cache import ResultCache
+from core.logic import _run_pipeline, analyze_feedback, analyze_feedback_batch
+from core.session import AnalysisSession
+
+# Session-dependent: every call stamps the current minute
+_IGNORED = ("timestamp",)
+
+def _comparable(outcomes):
+    return [({k: v for k, v in result.items() if k not in _IGNORED} if result else None, error)
+            for result, error in outcomes]
+
+def _diff(name: str, expected: list, actual: list) -> list:
+    mismatches = [i for i, (a, b) in enumerate(zip(expected, actual)) if a != b]
+    if len(expected) != len(actual):
+        mismatches.append(min(len(expected), len(actual)))
+    status = "ok" if not mismatches else f"FAILED at rows {mismatches[:5]}"
+    print(f"{name:>28}  {len(expected)} rows  {status}")
+    return mismatches
+
+def check_batch_matches_rows(texts, models, batch_size) -> list:
+    session = AnalysisSession()
+    per_row = []
+    for text in texts:
+        result, error = analyze_feedback(text, 'auto', models, session=session)
+        if result:
+            session.reviews.append(result)
+        per_row.append((result, error))
+    batched = analyze_feedback_batch(texts, 'auto', models, batch_size, session=AnalysisSession())
+    return _diff("batch vs per-row", _comparable(per_row), _comparable(batched))
+
+def check_cache_round_trip(texts, models, batch_size) -> list:
+    fd, path = tempfile.mkstemp(suffix=".sqlite3")
+    os.close(fd)
+    cache = ResultCache(path, revision="parity")
+    try:
+        fresh = analyze_feedback_batch(texts, 'auto', models, batch_size, cache=cache, session=AnalysisSession())
+        hits_before = cache.hits
+        cached = analyze_feedback_batch(texts, 'auto', models, batch_size, cache=cache, session=AnalysisSession())
+        stored = sum(1 for result, _ in fresh if result)
+        mismatches = _diff("cache round trip", _comparable(fresh), _comparable(cached))
+        if cache.hits - hits_before != stored:
+            print(f"{'':>28}  expected {stored} cache hits, got {cache.hits - hits_before}")
+            mismatches.append(-1)
+        return mismatches
+    finally:
+        cache.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+def check_long_reviews(texts, models, batch_size) -> list:
+    # Repeat reviews until they need several windows, past the window cap for some
+    long_texts = [" ".join([text] * (40 * (n % 8 + 1))) for n, text in enumerate(texts[:40])]
+    mixed = [text for pair in zip(texts, long_texts) for text in pair]
+    pipe = models['en']
+    windows, owners, _ = chunking.expand(pipe, long_texts)
+    if max(owners.count(i) for i in range(len(long_texts))) > chunking.MAX_WINDOWS:
+        print(f"{'window cap':>28}  exceeded")
+        return [-1]
+    batched = _run_pipeline(pipe, mixed, batch_size)
+    per_row = [(chunking.classify(pipe, text), None) for text in mixed]
+    return _diff("long-review windows", per_row, batched)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=300)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    texts = synthetic_corpus(args.rows, seed=args.seed)
+    # Exact repeats exercise the duplicate folding as well
+    texts += texts[:args.rows // 10]
+    models = {key: StandInPipeline(key) for key in ('en', 'multi')}
+    failed = False
+    for check in (check_batch_matches_rows, check_cache_round_trip, check_long_reviews):
+        failed = bool(check(texts, models, args.batch_size)) or failed
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""Per-stage benchmark of the analysis pipeline, with regression checks.
+
+    python -m benchmarks.pipeline --rows 5000 --output baseline.json
+    python -m benchmarks.pipeline --rows 5000 --compare baseline.json
+
+Measures hashing, language detection, authenticity and sentiment latency
+per row, end-to-end batch throughput, model load time and peak RSS on a
+synthetic English/Hindi/Telugu corpus. With --compare the command exits
+non-zero when any metric is worse than the baseline by more than
+--tolerance.
+
+Offline, pass --en-model/--multi-model with local checkpoint directories
+(small stand-in models), or --stand-in to replace the models with
+in-process fakes; the latter times everything except the forward pass.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import zlib
+
+from benchmarks.cold_start import _git_revision
+from benchmarks.corpus import DEFAULT_MIX, synthetic_corpus
+from core.logic import analyze_feedback_batch, analyze_texts
+from core.metrics import StageTimings
+from core.models import BACKENDS, DEFAULT_BACKEND, LazyModels
+from core.session import AnalysisSession
+from core.utils import create_feedback_hash
+
+# Stage name -> StageTimings keys that make it up
+_STAGES = {
+    "language_detection": ("language_script", "language_langdetect"),
+    "authenticity": ("model_en", "model_multi"),
+    "sentiment": ("sentiment_en", "sentiment_multi"),
+}
+
+class StandInPipeline:
+    """Deterministic fake of a text-classification pipeline, same label scheme."""
+
+    def __init__(self, key: str):
+        self.key = key
+
+    def _classify(self, text: str) -> dict:
+        digest = zlib.crc32(text.encode())
+        if self.key == 'en':
+            return {'label': "POSITIVE" if digest % 2 else "NEGATIVE", 'score': 0.5 + digest % 50 / 100}
+        stars = digest % 5 + 1
+        return {'label': f"{stars} star" + ("s" if stars > 1 else ""), 'score': 0.3 + digest % 60 / 100}
+
+    def __call__(self, texts, batch_size: int = None, **tokenizer_kwargs):
+        if isinstance(texts, str):
+            texts = [texts]
+        return [self._classify(text) for text in texts]
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run(texts: list, models, batch_size: int, repeat: int) -> dict:
+    """Best-of-`repeat` metrics; lower is better except for *_per_sec."""
+    metrics = {}
+    if isinstance(models, LazyModels):
+        for key in models:
+            models[key]
+        for key, seconds in models.load_seconds.items():
+            metrics[f"load_seconds_{key}"] = seconds
+    models = dict(models.items())
+
+    best = {}
+    def keep(name, value, higher_is_better=False):
+        better = max if higher_is_better else min
+        best[name] = better(best.get(name, value), value)
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in texts:
+            create_feedback_hash(text)
+        keep("hashing", (time.perf_counter() - started) / len(texts))
+
+        timings = StageTimings()
+        analyze_texts(texts, 'auto', models, batch_size, timings)
+        for stage, keys in _STAGES.items():
+            keep(stage, sum(timings.seconds.get(key, 0.0) for key in keys) / len(texts))
+
+        started = time.perf_counter()
+        analyze_feedback_batch(texts, 'auto', models, batch_size, session=AnalysisSession())
+        keep("throughput", len(texts) / (time.perf_counter() - started), higher_is_better=True)
+
+    for stage in ("hashing", *_STAGES):
+        metrics[f"{stage}_ms_per_row"] = best[stage] * 1000
+    metrics["throughput_rows_per_sec"] = best["throughput"]
+    rss = peak_rss_mb()
+    if rss is not None:
+        metrics["peak_rss_mb"] = rss
+    return metrics
+
+def compare(metrics: dict, baseline: dict, tolerance: float) -> list:
+    """Print current vs baseline and return the names of regressed metrics."""
+    regressions = []
+    print(f"{'metric':>32} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, current in metrics.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        change = (current - previous) / previous if previous else 0.0
+        worse = -change if name.endswith("_per_sec") else change
+        flag = ""
+        if worse > tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:>32} {previous:>10.3f} {current:>10.3f} {change:>+8.1%}{flag}")
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--mix", type=json.loads, default=DEFAULT_MIX,
+                        help='Language shares as JSON, e.g. \'{"en": 0.5, "hi": 0.5}\'')
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the best is kept")
+    parser.add_argument("--backend", choices=BACKENDS, default=DEFAULT_BACKEND)
+    parser.add_argument("--en-model", help="Checkpoint name or local directory for the English model")
+    parser.add_argument("--multi-model", help="Checkpoint name or local directory for the multilingual model")
+    parser.add_argument("--stand-in", action="store_true", help="Use in-process fake models")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="Report JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed slowdown, as a fraction")
+    args = parser.parse_args(argv)
+
+    if args.stand_in:
+        models = {key: StandInPipeline(key) for key in ('en', 'multi')}
+        model_names = "stand-in"
+    else:
+        overrides = {key: name for key, name in (('en', args.en_model), ('multi', args.multi_model)) if name}
+        models = LazyModels(args.backend, model_names=overrides)
+        model_names = models.model_names
+
+    config = {"rows": args.rows, "mix": args.mix, "seed": args.seed, "batch_size": args.batch_size,
+              "backend": args.backend, "models": model_names}
+    texts = synthetic_corpus(args.rows, args.mix, seed=args.seed)
+    report = {
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": config,
+        "metrics": run(texts, models, args.batch_size, args.repeat),
+    }
+
+    status = 0
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != config:
+            print("warning: baseline was recorded with a different configuration", file=sys.stderr)
+        regressions = compare(report["metrics"], baseline.get("metrics", {}), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}")
+            status = 1
+    else:
+        for name, value in report["metrics"].items():
+            print(f"{name:>32} {value:>10.3f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+import re
+from collections import Counter
+
+import numpy as np
+
+CONFIDENCE_BINS = 10
+# Same token pattern WordCloud uses; stopwords are dropped when the cloud is drawn
+_TOKEN = re.compile(r"\w[\w']+")
+
+class ReviewAggregates:
+    """Running counts and sums behind the Advanced Insights metrics.
+
+    Updated from the category codes of each batch of new reviews (see
+    `ReviewStore.extend`), so reading any metric costs the same no matter
+    how many reviews there are. `reset()` returns to the empty state.
+    """
+
+    def __init__(self, categories: dict):
+        self.categories = categories
+        self._codes = {name: {value: code for code, value in enumerate(values)}
+                       for name, values in categories.items()}
+        self.reset()
+
+    def reset(self):
+        n_class = len(self.categories["classification"])
+        self.total = 0
+        # classification x sentiment, so ratios like "positive among genuine" are O(1)
+        self.joint = np.zeros((n_class, len(self.categories["sentiment"])), np.int64)
+        self.language_counts = np.zeros(len(self.categories["language"]), np.int64)
+        self.confidence_sum = np.zeros(n_class, np.float64)
+        self.confidence_hist = np.zeros((n_class, CONFIDENCE_BINS), np.int64)
+        self.keywords = [Counter() for _ in self.categories["classification"]]
+
+    def update(self, classification, sentiment, language, confidence):
+        """Add a batch of reviews given their code arrays and confidences."""
+        self.total += len(classification)
+        np.add.at(self.joint, (classification, sentiment), 1)
+        self.language_counts += np.bincount(language, minlength=len(self.language_counts))
+        np.add.at(self.confidence_sum, classification, confidence)
+        bins = np.minimum((np.asarray(confidence) * CONFIDENCE_BINS).astype(np.int64), CONFIDENCE_BINS - 1)
+        np.add.at(self.confidence_hist, (classification, bins), 1)
+
+    def add_texts(self, classification, texts):
+        """Count the tokens of new reviews, per classification."""
+        for code, text in zip(classification, texts):
+            self.keywords[code].update(_TOKEN.findall(text.lower()))
+
+    def keyword_counts(self, classification: str) -> Counter:
+        return self.keywords[self._codes["classification"][classification]]
+
+    def counts(self, field: str) -> dict:
+        if field == "classification":
+            values = self.joint.sum(axis=1)
+        elif field == "sentiment":
+            values = self.joint.sum(axis=0)
+        else:
+            values = self.language_counts
+        return dict(zip(self.categories[field], values.tolist()))
+
+    def share(self, field: str, value: str) -> float:
+        return self.counts(field)[value] / self.total if self.total else np.nan
+
+    def mean_confidence(self, classification: str) -> float:
+        code = self._codes["classification"][classification]
+        count = self.joint[code].sum()
+        return self.confidence_sum[code] / count if count else np.nan
+
+    def sentiment_share(self, classification: str, sentiment: str) -> float:
+        """Share of `classification` reviews that have `sentiment`."""
+        row = self.joint[self._codes["classification"][classification]]
+        count = row.sum()
+        return row[self._codes["sentiment"][sentiment]] / count if count else np.nan
+
+    def confidence_histogram(self):
+        """(bin edges, counts) of confidence over all reviews."""
+        return np.linspace(0.0, 1.0, CONFIDENCE_BINS + 1), self.confidence_hist.sum(axis=0)
@@ -0,0 +1,139 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .models import model_revision
+
+DEFAULT_CACHE_PATH = os.environ.get("RESULT_CACHE_PATH", os.path.join(".cache", "results.sqlite3"))
+DEFAULT_CACHE_MAX_BYTES = int(os.environ.get("RESULT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Fields that depend only on the text, the language choice and the models.
+# 'id' and 'timestamp' belong to the session and are filled in on every hit.
+CACHED_FIELDS = ("language", "classification", "confidence", "sentiment", "polarity")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    feedback_hash TEXT NOT NULL,
+    language TEXT NOT NULL,
+    revision TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (feedback_hash, language, revision)
+);
+CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access);
+-- Total payload bytes, kept by triggers so every process sharing the file sees
+-- the same figure without summing the whole table on each write
+CREATE TABLE IF NOT EXISTS cache_size (total INTEGER NOT NULL);
+CREATE TRIGGER IF NOT EXISTS results_size_insert AFTER INSERT ON results
+BEGIN UPDATE cache_size SET total = total + NEW.size; END;
+CREATE TRIGGER IF NOT EXISTS results_size_update AFTER UPDATE OF size ON results
+BEGIN UPDATE cache_size SET total = total + NEW.size - OLD.size; END;
+CREATE TRIGGER IF NOT EXISTS results_size_delete AFTER DELETE ON results
+BEGIN UPDATE cache_size SET total = total - OLD.size; END;
+"""
+_UPSERT = """
+INSERT INTO results VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (feedback_hash, language, revision)
+DO UPDATE SET payload = excluded.payload, size = excluded.size, last_access = excluded.last_access
+"""
+
+class ResultCache:
+    """Disk-backed cache of analysis results with size-based LRU eviction.
+
+    Entries are keyed by (feedback hash, language choice, model revision), so
+    switching models or the language selector never serves a stale verdict.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 revision: str = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.revision = revision or model_revision()
+        self.hits = 0
+        self.misses = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        with self._conn:
+            # Single statement, so two processes opening a new file cannot both seed it
+            self._conn.execute("INSERT INTO cache_size SELECT (SELECT COALESCE(SUM(size), 0) FROM results) "
+                               "WHERE NOT EXISTS (SELECT 1 FROM cache_size)")
+
+    def get(self, feedback_hash: str, language: str):
+        return self.get_many([feedback_hash], language).get(feedback_hash)
+
+    def get_many(self, feedback_hashes, language: str) -> dict:
+        feedback_hashes = list(dict.fromkeys(feedback_hashes))
+        found = {}
+        with self._lock, self._conn:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(feedback_hashes), 500):
+                chunk = feedback_hashes[start:start + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT feedback_hash, payload FROM results "
+                    f"WHERE language = ? AND revision = ? AND feedback_hash IN ({marks})",
+                    [language, self.revision, *chunk],
+                ).fetchall()
+                for feedback_hash, payload in rows:
+                    found[feedback_hash] = json.loads(payload)
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE results SET last_access = ? WHERE feedback_hash = ? AND language = ? AND revision = ?",
+                    [(now, h, language, self.revision) for h in found],
+                )
+        self.hits += len(found)
+        self.misses += len(feedback_hashes) - len(found)
+        return found
+
+    def put(self, feedback_hash: str, language: str, result: dict):
+        self.put_many([(feedback_hash, result)], language)
+
+    def put_many(self, items, language: str):
+        now = time.time()
+        rows = []
+        for feedback_hash, result in items:
+            payload = json.dumps({field: result[field] for field in CACHED_FIELDS})
+            rows.append((feedback_hash, language, self.revision, payload, len(payload), now))
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(_UPSERT, rows)
+            # Read inside the write transaction: other processes may have
+            # written to the same file since this one last looked
+            total = self._conn.execute("SELECT total FROM cache_size").fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(total)
+
+    def _evict(self, total: int):
+        # Drop least recently used entries until we are back under 90% of the budget
+        target = int(self.max_bytes * 0.9)
+        cursor = self._conn.execute("SELECT rowid, size FROM results ORDER BY last_access")
+        doomed = []
+        for rowid, size in cursor:
+            if total <= target:
+                break
+            doomed.append((rowid,))
+            total -= size
+        cursor.close()
+        self._conn.executemany("DELETE FROM results WHERE rowid = ?", doomed)
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
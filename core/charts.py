@@ -0,0 +1,72 @@
+import io
+
+MAX_CLOUD_WORDS = 200
+
+def _png(fig) -> bytes:
+    import matplotlib.pyplot as plt
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
+def _count_chart(counts: dict, order: list, palette: list) -> bytes:
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    fig, ax = plt.subplots()
+    sns.barplot(x=order, y=[counts[value] for value in order], hue=order, palette=palette, legend=False, ax=ax)
+    ax.set_xlabel("")
+    ax.set_ylabel("Count")
+    return _png(fig)
+
+def _confidence_chart(stats) -> bytes:
+    import matplotlib.pyplot as plt
+
+    edges, counts = stats.confidence_histogram()
+    fig, ax = plt.subplots()
+    ax.bar(edges[:-1], counts, width=edges[1] - edges[0], align="edge", color="#4f46e5", edgecolor="white")
+    ax.set_xlabel("Confidence Level")
+    ax.set_ylabel("Count")
+    return _png(fig)
+
+def _word_cloud(stats, classification: str):
+    from wordcloud import STOPWORDS, WordCloud
+
+    frequencies = {}
+    for word, count in stats.keyword_counts(classification).most_common():
+        if word not in STOPWORDS and not word.isdigit():
+            frequencies[word] = count
+            if len(frequencies) == MAX_CLOUD_WORDS:
+                break
+    if not frequencies:
+        return None
+    cloud = WordCloud(width=800, height=400, background_color='white', max_words=MAX_CLOUD_WORDS)
+    buffer = io.BytesIO()
+    cloud.generate_from_frequencies(frequencies).to_image().save(buffer, format="PNG")
+    return buffer.getvalue()
+
+def render_charts(stats) -> dict:
+    """PNG bytes for every Advanced Insights chart, drawn from running aggregates.
+
+    Word clouds come from the incrementally maintained token counts, so no
+    review text is joined or re-tokenized here. A cloud is None when its
+    class has no words yet.
+    """
+    return {
+        "authenticity": _count_chart(stats.counts("classification"), ["GENUINE", "FAKE"], ['#2a9d8f', '#e63946']),
+        "sentiment": _count_chart(stats.counts("sentiment"), ['POSITIVE', 'NEGATIVE', 'NEUTRAL'],
+                                  ['#2a9d8f', '#e63946', '#3a86ff']),
+        "language": _count_chart(stats.counts("language"), ["English", "Hindi", "Telugu"],
+                                 ['#4f46e5', '#e63946', '#2a9d8f']),
+        "confidence": _confidence_chart(stats),
+        "cloud_GENUINE": _word_cloud(stats, "GENUINE"),
+        "cloud_FAKE": _word_cloud(stats, "FAKE"),
+    }
+
+def cached_charts(cache: dict, store) -> dict:
+    """`render_charts` for `store`, redrawn only when `store.version` changes."""
+    if cache.get("version") != store.version:
+        cache["charts"] = render_charts(store.stats)
+        cache["version"] = store.version
+    return cache["charts"]
@@ -0,0 +1,95 @@
+import os
+import re
+
+# Both checkpoints in core.models accept at most 512 tokens
+MAX_MODEL_TOKENS = 512
+# Tokens shared by consecutive windows, so no sentence is only seen cut in half
+WINDOW_OVERLAP = int(os.environ.get("WINDOW_OVERLAP_TOKENS", 64))
+# Cost cap: a review never costs more than this many forward passes. Longer
+# reviews are represented by evenly spaced windows across the whole text.
+MAX_WINDOWS = int(os.environ.get("MAX_WINDOWS_PER_REVIEW", 8))
+
+_WORD = re.compile(r"\S+")
+
+def window_size(pipe) -> int:
+    """Content tokens per window, leaving room for the special tokens."""
+    tokenizer = getattr(pipe, 'tokenizer', None)
+    if tokenizer is None:
+        return MAX_MODEL_TOKENS
+    limit = min(getattr(tokenizer, 'model_max_length', None) or MAX_MODEL_TOKENS, MAX_MODEL_TOKENS)
+    return limit - tokenizer.num_special_tokens_to_add()
+
+def token_spans(pipe, texts: list) -> list:
+    """(start, end) character offsets of every token, one tokenizer call for all texts.
+
+    Falls back to whitespace-separated words when the pipeline has no fast
+    tokenizer (offsets need one).
+    """
+    tokenizer = getattr(pipe, 'tokenizer', None)
+    if tokenizer is not None and getattr(tokenizer, 'is_fast', False) and texts:
+        try:
+            encoded = tokenizer(texts, add_special_tokens=False, return_offsets_mapping=True)
+            return [list(offsets) for offsets in encoded['offset_mapping']]
+        except Exception:
+            pass
+    return [[match.span() for match in _WORD.finditer(text)] for text in texts]
+
+def split_windows(text: str, spans: list, size: int, overlap: int = WINDOW_OVERLAP,
+                  max_windows: int = MAX_WINDOWS) -> list:
+    """Overlapping windows of at most `size` tokens as (text, token count) pairs.
+
+    A text that fits is returned whole, so short reviews are unaffected.
+    """
+    if len(spans) <= size:
+        return [(text, max(len(spans), 1))]
+    step = max(size - overlap, 1)
+    starts = list(range(0, len(spans) - size, step)) + [len(spans) - size]
+    if len(starts) > max_windows:
+        last = len(starts) - 1
+        starts = [starts[round(k * last / max(max_windows - 1, 1))] for k in range(max_windows)]
+    return [(text[spans[start][0]:spans[start + size - 1][1]], size) for start in starts]
+
+def expand(pipe, texts: list, max_windows: int = MAX_WINDOWS):
+    """Windows for all `texts`, tokenizing only the texts that may not fit.
+
+    A WordPiece token covers at least one character, so a text no longer
+    than the window in characters always fits and is passed through without
+    an extra tokenizer call. The pipeline's own tokenization is then the
+    only one. Returns (windows, owners, weights): window texts, the index
+    of the text each came from, and its length. The length is in tokens for
+    split texts and in characters for the rest; only split texts are
+    aggregated, and the lengths otherwise only order the batches.
+    """
+    size = window_size(pipe)
+    long = [i for i, text in enumerate(texts) if len(text) > size]
+    spans = dict(zip(long, token_spans(pipe, [texts[i] for i in long])))
+    windows, owners, weights = [], [], []
+    for i, text in enumerate(texts):
+        pieces = split_windows(text, spans[i], size, max_windows=max_windows) if i in spans \
+            else [(text, max(len(text), 1))]
+        for window, length in pieces:
+            windows.append(window)
+            owners.append(i)
+            weights.append(length)
+    return windows, owners, weights
+
+def aggregate(outputs: list, weights: list) -> dict:
+    """One {'label', 'score'} verdict from per-window outputs.
+
+    The label with the largest token-weighted score mass wins; its score is
+    the weighted mean over the windows that voted for it. A single window
+    is returned as is.
+    """
+    if len(outputs) == 1:
+        return outputs[0]
+    mass, votes = {}, {}
+    for output, weight in zip(outputs, weights):
+        mass[output['label']] = mass.get(output['label'], 0.0) + weight * output['score']
+        votes[output['label']] = votes.get(output['label'], 0) + weight
+    label = max(mass, key=mass.get)
+    return {'label': label, 'score': mass[label] / votes[label]}
+
+def classify(pipe, text: str, max_windows: int = MAX_WINDOWS) -> dict:
+    """Single-text counterpart of the batched path in `core.logic._run_pipeline`."""
+    windows, _, weights = expand(pipe, [text], max_windows)
+    return aggregate(pipe(windows, truncation=True), weights)
@@ -0,0 +1,117 @@
+"""Headless batch analysis.
+
+    python -m core.cli reviews.csv results.parquet --batch-size 64 --threads 8
+"""
+import argparse
+import sys
+import time
+
+from .ingest import DEFAULT_CHUNK_SIZE, MissingColumnError, iter_feedback_chunks
+from .export import EXPORT_FORMATS, open_writer
+from .logic import DEFAULT_BATCH_SIZE, analyze_feedback_batch
+from .metrics import StageTimings
+from .models import BACKENDS, DEFAULT_BACKEND
+from .session import AnalysisSession
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m core.cli", description="Analyze a CSV/Excel feedback file without the web UI.")
+    parser.add_argument("input", help="CSV or xlsx file with a 'feedback' or 'text' column")
+    parser.add_argument("output", help="Output file (.csv, .jsonl or .parquet)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, help="Output format (default: from the output extension)")
+    parser.add_argument("--language", choices=['auto', 'en', 'hi', 'te'], default='auto')
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Rows read from the input per chunk")
+    parser.add_argument("--backend", choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help="Inference backend (default: MODEL_BACKEND or torch)")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="torch intra-op threads (per worker with --workers)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes; each loads its own copy of the models")
+    parser.add_argument("--cache", default=None, help="Result cache file (default: RESULT_CACHE_PATH)")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the result cache")
+    parser.add_argument("--near-duplicates", action="store_true",
+                        help="Cluster near-identical reviews (MinHash/LSH) and add a cluster_id column")
+    parser.add_argument("--reuse-clusters", action="store_true",
+                        help="With --near-duplicates, copy each cluster's first result instead of re-running the models")
+    parser.add_argument("--timings", action="store_true", help="Print per-stage timings at the end")
+    return parser
+
+def run(args) -> int:
+    from .cache import ResultCache
+    from .dedupe import NearDuplicateIndex
+    from .models import load_models, model_revision
+
+    timings = StageTimings()
+    near_duplicates = NearDuplicateIndex() if args.near_duplicates or args.reuse_clusters else None
+    reuse_clusters = args.reuse_clusters
+    if args.workers > 1:
+        from .parallel import ParallelAnalyzer
+
+        analyzer = ParallelAnalyzer(args.workers, args.threads, args.batch_size, args.backend)
+
+        def analyze(texts, selected_language, cache=None, session=None):
+            return analyzer.analyze_batch(texts, selected_language, cache=cache, session=session,
+                                          near_duplicates=near_duplicates, reuse_clusters=reuse_clusters)
+    else:
+        if args.threads:
+            import torch
+
+            torch.set_num_threads(args.threads)
+        models = load_models(on_error=lambda message: print(message, file=sys.stderr), backend=args.backend)
+        if models.get('en') is None and models.get('multi') is None:
+            return 1
+        analyzer = None
+
+        def analyze(texts, selected_language, cache=None, session=None):
+            return analyze_feedback_batch(texts, selected_language, models, batch_size=args.batch_size,
+                                          cache=cache, session=session, timings=timings,
+                                          near_duplicates=near_duplicates, reuse_clusters=reuse_clusters)
+
+    cache = None
+    if not args.no_cache:
+        revision = model_revision(args.backend)
+        cache = ResultCache(args.cache, revision=revision) if args.cache else ResultCache(revision=revision)
+    session = AnalysisSession()
+
+    rows = written = errors = 0
+    started = time.perf_counter()
+    writer = open_writer(args.output, args.format)
+    try:
+        with open(args.input, 'rb') as fileobj:
+            for texts, chunk_rows, _ in iter_feedback_chunks(fileobj, args.input, args.chunk_size):
+                results = []
+                for result, error in analyze(texts, args.language, cache=cache, session=session):
+                    if result:
+                        # Reviews are streamed out rather than kept in the session
+                        result['id'] = written + len(results) + 1
+                        results.append(result)
+                    elif error:
+                        errors += 1
+                writer.write(results)
+                rows += chunk_rows
+                written += len(results)
+                elapsed = time.perf_counter() - started
+                print(f"{rows:,} rows read, {written:,} analyzed ({rows / max(elapsed, 1e-9):,.0f} rows/sec)",
+                      file=sys.stderr)
+    except MissingColumnError as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 2
+    finally:
+        writer.close()
+        if analyzer is not None:
+            analyzer.close()
+        if cache is not None:
+            cache.close()
+
+    print(f"Done: {written:,} results written to {args.output}, {errors:,} rows skipped", file=sys.stderr)
+    if args.timings:
+        # Stages run inside the workers are not visible here with --workers
+        print(f"Stage timings: {timings.summary() or 'n/a'}", file=sys.stderr)
+    return 0
+
+def main(argv=None) -> int:
+    return run(build_parser().parse_args(argv))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+import re
+import zlib
+
+import numpy as np
+
+# Hash shingles into [0, p) and permute with (a*x + b) mod p. With p < 2**31
+# every product stays below 2**63, so uint64 arithmetic never overflows.
+_PRIME = np.uint64((1 << 31) - 1)
+_WORD = re.compile(r"\w+")
+
+class NearDuplicateIndex:
+    """MinHash signatures plus an LSH index for clustering near-identical reviews.
+
+    Reviews are shingled into character n-grams of their normalized text.
+    Each signature is split into `bands` bands; reviews that share any band
+    are candidates and join a cluster when their estimated Jaccard similarity
+    to the cluster representative is at least `threshold`. A lookup only
+    touches the buckets of its own bands, so it does not grow with the number
+    of indexed reviews.
+
+    `results` maps a cluster id to the analysis fields of its representative
+    once known, so callers can reuse them for later members.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, bands: int = 16,
+                 shingle_size: int = 5, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(_PRIME), size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, int(_PRIME), size=num_perm).astype(np.uint64)
+        self.clear()
+
+    def empty_like(self) -> "NearDuplicateIndex":
+        """An empty index with the same permutations, so signatures are comparable."""
+        other = NearDuplicateIndex.__new__(NearDuplicateIndex)
+        other.threshold, other.bands, other.shingle_size = self.threshold, self.bands, self.shingle_size
+        other._a, other._b = self._a, self._b
+        other.clear()
+        return other
+
+    def clear(self):
+        self._buckets = {}
+        self._representatives = []
+        self.sizes = []
+        self.results = {}
+
+    def __len__(self):
+        return len(self._representatives)
+
+    def signature(self, text: str) -> np.ndarray:
+        normalized = " ".join(_WORD.findall(text.lower()))
+        k = self.shingle_size
+        shingles = {normalized[i:i + k] for i in range(max(1, len(normalized) - k + 1))}
+        hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), np.uint64, len(shingles)) % _PRIME
+        return ((self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME).min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray):
+        return [(band, rows.tobytes()) for band, rows in enumerate(signature.reshape(self.bands, -1))]
+
+    def find(self, signature: np.ndarray):
+        """Cluster id of the most similar cluster above the threshold, or None."""
+        candidates = set()
+        for key in self._band_keys(signature):
+            candidates.update(self._buckets.get(key, ()))
+        best, best_similarity = None, self.threshold
+        for cluster_id in candidates:
+            similarity = np.mean(self._representatives[cluster_id] == signature)
+            if similarity >= best_similarity:
+                best, best_similarity = cluster_id, similarity
+        return best
+
+    def add(self, signature: np.ndarray):
+        """Place a review in its cluster, creating one if needed.
+
+        Returns (cluster_id, is_new_cluster).
+        """
+        cluster_id = self.find(signature)
+        is_new = cluster_id is None
+        if is_new:
+            cluster_id = len(self._representatives)
+            self._representatives.append(signature)
+            self.sizes.append(0)
+        self.sizes[cluster_id] += 1
+        self._insert(signature, cluster_id)
+        return cluster_id, is_new
+
+    def representative(self, cluster_id: int):
+        """Signature that decides membership of `cluster_id` (None if unknown)."""
+        return self._representatives[cluster_id] if cluster_id < len(self._representatives) else None
+
+    def restore(self, signature, cluster_id: int, size: int = 1):
+        """Re-add a stored cluster of `size` reviews under its original id.
+
+        Only the representative's signature is indexed. Ids are kept as
+        stored, gaps included, so clusters created afterwards never reuse an
+        id that is already on disk. With `signature` None the id is only
+        reserved, and no later review can join it.
+        """
+        while len(self._representatives) <= cluster_id:
+            self._representatives.append(None)
+            self.sizes.append(0)
+        if signature is not None and self._representatives[cluster_id] is None:
+            self._representatives[cluster_id] = signature
+            self._insert(signature, cluster_id)
+        self.sizes[cluster_id] += size
+
+    def _insert(self, signature: np.ndarray, cluster_id: int):
+        for key in self._band_keys(signature):
+            bucket = self._buckets.setdefault(key, [])
+            if cluster_id not in bucket:
+                bucket.append(cluster_id)
@@ -0,0 +1,88 @@
+import json
+
+import pandas as pd
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+
+def infer_format(path: str) -> str:
+    suffix = path.rsplit('.', 1)[-1].lower() if '.' in path else ''
+    if suffix in ('json', 'ndjson'):
+        return 'jsonl'
+    if suffix in EXPORT_FORMATS:
+        return suffix
+    raise ValueError(f"Cannot infer output format from '{path}', use one of: {', '.join(EXPORT_FORMATS)}")
+
+class CsvWriter:
+    def __init__(self, path: str):
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._header = True
+
+    def write(self, results: list):
+        if results:
+            pd.DataFrame(results).to_csv(self._file, index=False, header=self._header)
+            self._header = False
+
+    def close(self):
+        self._file.close()
+
+class JsonlWriter:
+    def __init__(self, path: str):
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, results: list):
+        for result in results:
+            self._file.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+    def close(self):
+        self._file.close()
+
+class ParquetWriter:
+    def __init__(self, path: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)")
+        self._pa, self._pq = pa, pq
+        self.path = path
+        # Fixed up front: inferring from the first chunk types an all-None
+        # column (e.g. cluster_id) as null, and later chunks cannot be cast to it
+        self.schema = pa.schema([
+            ("id", pa.int64()),
+            ("text", pa.string()),
+            ("language", pa.string()),
+            ("classification", pa.string()),
+            ("confidence", pa.float64()),
+            ("sentiment", pa.string()),
+            ("polarity", pa.float64()),
+            ("timestamp", pa.string()),
+            ("cluster_id", pa.int64()),
+        ])
+        self._writer = None
+
+    def write(self, results: list):
+        if not results:
+            return
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.path, self.schema)
+        self._writer.write_table(self._pa.Table.from_pylist(results, schema=self.schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+_WRITERS = {'csv': CsvWriter, 'jsonl': JsonlWriter, 'parquet': ParquetWriter}
+
+def open_writer(path: str, fmt: str = None):
+    """Open an incremental writer; call `write(results)` per chunk, then `close()`."""
+    return _WRITERS[fmt or infer_format(path)](path)
+
+def write_store(store, path: str, indices=None, fmt: str = None, chunk_size: int = 5000):
+    """Write reviews from a ReviewStore (all, or `indices`) `chunk_size` rows at a time."""
+    indices = range(len(store)) if indices is None else indices
+    writer = open_writer(path, fmt)
+    try:
+        for start in range(0, len(indices), chunk_size):
+            writer.write(list(store.rows(indices[start:start + chunk_size])))
+    finally:
+        writer.close()
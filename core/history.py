@@ -0,0 +1,198 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from .cache import CACHED_FIELDS
+from .store import COLUMNS, NO_CLUSTER, ReviewStore
+from .utils import create_feedback_hash
+
+DEFAULT_HISTORY_DIR = os.environ.get("REVIEW_HISTORY_DIR", os.path.join(".cache", "history"))
+# Histories untouched for this long are deleted by prune_histories (0 keeps them)
+HISTORY_RETENTION_DAYS = float(os.environ.get("REVIEW_HISTORY_RETENTION_DAYS", 30))
+DEFAULT_LOAD_CHUNK = 10000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    id INTEGER NOT NULL,
+    feedback_hash TEXT NOT NULL,
+    text TEXT NOT NULL,
+    language TEXT NOT NULL,
+    classification TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    sentiment TEXT NOT NULL,
+    polarity REAL NOT NULL,
+    timestamp TEXT NOT NULL,
+    cluster_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS reviews_hash ON reviews (feedback_hash);
+CREATE TABLE IF NOT EXISTS clusters (
+    cluster_id INTEGER PRIMARY KEY,
+    signature BLOB NOT NULL
+);
+"""
+_INSERT = f"INSERT INTO reviews (feedback_hash, {', '.join(COLUMNS)}) VALUES ({', '.join('?' * (len(COLUMNS) + 1))})"
+
+class ReviewHistory:
+    """Append-only SQLite (WAL) log of analyzed reviews, so work survives restarts.
+
+    Rows are written in the order they were analyzed, and the implicit rowid
+    keeps that order on reload. Reads go through SQLite's memory-mapped I/O.
+    The duplicate-check hashes come from a separate index, so rebuilding
+    `processed_hashes` never touches the review texts. With a
+    `near_duplicates` index attached, the MinHash signature of each new
+    cluster's representative is stored too, so clusters come back without
+    re-hashing any text.
+
+    The file is only created by the first `append`; until then reads see
+    an empty history. `clear` deletes it again.
+    """
+
+    def __init__(self, path: str, mmap_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.mmap_bytes = mmap_bytes
+        self.near_duplicates = None
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self, create: bool = False):
+        # Caller holds the lock. Returns None when there is nothing to read yet.
+        if self._conn is None:
+            if not create and not os.path.exists(self.path):
+                return None
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_bytes)}")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def append(self, results):
+        rows = [
+            (create_feedback_hash(result["text"]),
+             *(result.get("cluster_id") if name == "cluster_id" else result[name] for name in COLUMNS))
+            for result in results
+        ]
+        clusters = []
+        if self.near_duplicates is not None:
+            cluster_ids = {result.get("cluster_id") for result in results} - {None, NO_CLUSTER}
+            for cluster_id in sorted(cluster_ids):
+                signature = self.near_duplicates.representative(cluster_id)
+                if signature is not None:
+                    # Values are below 2**31 (see core.dedupe), so 32 bits are enough
+                    clusters.append((cluster_id, signature.astype(np.uint32).tobytes()))
+        if rows:
+            with self._lock:
+                conn = self._connect(create=True)
+                with conn:
+                    conn.executemany(_INSERT, rows)
+                    conn.executemany("INSERT OR IGNORE INTO clusters VALUES (?, ?)", clusters)
+
+    def _query(self, sql: str, params=()) -> list:
+        with self._lock:
+            conn = self._connect()
+            return [] if conn is None else conn.execute(sql, params).fetchall()
+
+    def cluster_signatures(self) -> dict:
+        """{cluster id: representative signature} for every stored cluster."""
+        rows = self._query("SELECT cluster_id, signature FROM clusters")
+        return {cluster_id: np.frombuffer(blob, np.uint32).astype(np.uint64) for cluster_id, blob in rows}
+
+    def hashes(self) -> set:
+        return {row[0] for row in self._query("SELECT feedback_hash FROM reviews INDEXED BY reviews_hash")}
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_LOAD_CHUNK):
+        """Stored reviews as lists of result dicts, oldest first."""
+        last = 0
+        while True:
+            rows = self._query(
+                f"SELECT rowid, {', '.join(COLUMNS)} FROM reviews WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (last, chunk_size),
+            )
+            if not rows:
+                return
+            last = rows[-1][0]
+            yield [dict(zip(COLUMNS, row[1:])) for row in rows]
+
+    def clear(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            _remove_database(self.path)
+
+    def __len__(self):
+        rows = self._query("SELECT COUNT(*) FROM reviews")
+        return rows[0][0] if rows else 0
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+def _remove_database(path: str):
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
+def prune_histories(directory: str = DEFAULT_HISTORY_DIR, max_age_days: float = HISTORY_RETENTION_DAYS) -> int:
+    """Delete histories nobody has written to for `max_age_days`; returns how many.
+
+    A value of 0 or less keeps every history.
+    """
+    if max_age_days <= 0 or not os.path.isdir(directory):
+        return 0
+    cutoff = time.time() - max_age_days * 24 * 3600
+    removed = 0
+    for name in os.listdir(directory):
+        if not name.endswith(".sqlite3"):
+            continue
+        path = os.path.join(directory, name)
+        # Recent writes may only have reached the WAL file so far
+        modified = max(os.path.getmtime(path + suffix) for suffix in ("", "-wal", "-shm")
+                       if os.path.exists(path + suffix))
+        if modified < cutoff:
+            _remove_database(path)
+            removed += 1
+    return removed
+
+def history_path(token: str, directory: str = DEFAULT_HISTORY_DIR) -> str:
+    """File holding the history of one session, `token` being a hex string."""
+    if not re.fullmatch(r"[0-9a-f]{32}", token):
+        raise ValueError(f"Invalid history token '{token}'")
+    return os.path.join(directory, f"{token}.sqlite3")
+
+def restore_session(history: ReviewHistory, near_duplicates=None, chunk_size: int = DEFAULT_LOAD_CHUNK):
+    """(ReviewStore, processed hashes) rebuilt from `history`.
+
+    The store is attached to `history` afterwards, so new reviews are
+    appended to it. With `near_duplicates`, every stored cluster is put
+    back under its original id from its saved representative signature,
+    with its size and the result of its first review for reuse. No text is
+    re-hashed. Clusters saved without a signature keep their ids reserved
+    but cannot gain new members.
+    """
+    store = ReviewStore()
+    for results in history.iter_chunks(chunk_size):
+        store.extend(results)
+    if near_duplicates is not None:
+        signatures = history.cluster_signatures()
+        cluster_column = store.column("cluster_id")
+        clustered = np.flatnonzero(cluster_column != NO_CLUSTER)
+        cluster_ids, first, sizes = np.unique(cluster_column[clustered], return_index=True, return_counts=True)
+        for cluster_id, row, size in zip(cluster_ids.tolist(), clustered[first].tolist(), sizes.tolist()):
+            near_duplicates.restore(signatures.get(cluster_id), cluster_id, size)
+            result = store.row(row)
+            near_duplicates.results[cluster_id] = {field: result[field] for field in CACHED_FIELDS}
+        history.near_duplicates = near_duplicates
+    store.history = history
+    return store, history.hashes()
@@ -0,0 +1,71 @@
+import os
+
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 5000
+FEEDBACK_COLUMNS = ('feedback', 'text')
+
+class MissingColumnError(ValueError):
+    pass
+
+def find_feedback_column(columns):
+    for name in FEEDBACK_COLUMNS:
+        if name in columns:
+            return name
+    raise MissingColumnError("File must contain a 'feedback' or 'text' column")
+
+def _is_feedback(value) -> bool:
+    return pd.notna(value) and isinstance(value, str)
+
+def _file_size(fileobj) -> int:
+    size = getattr(fileobj, 'size', None)
+    if size is None:
+        position = fileobj.tell()
+        size = fileobj.seek(0, os.SEEK_END)
+        fileobj.seek(position)
+    return size
+
+def _iter_csv(fileobj, chunksize: int):
+    column = find_feedback_column(pd.read_csv(fileobj, nrows=0).columns)
+    fileobj.seek(0)
+    size = _file_size(fileobj) or 1
+    # Only the feedback column is parsed, the rest of each row is skipped
+    for chunk in pd.read_csv(fileobj, usecols=[column], chunksize=chunksize):
+        texts = [str(value) for value in chunk[column] if _is_feedback(value)]
+        yield texts, len(chunk), min(fileobj.tell() / size, 1.0)
+
+def _iter_xlsx(fileobj, chunksize: int):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, ())
+        position = list(header).index(find_feedback_column(header))
+        total = max((sheet.max_row or 0) - 1, 1)
+        seen = 0
+        texts = []
+        for row in rows:
+            seen += 1
+            value = row[position] if position < len(row) else None
+            if _is_feedback(value):
+                texts.append(str(value))
+            if seen % chunksize == 0:
+                yield texts, chunksize, min(seen / total, 1.0)
+                texts = []
+        if seen % chunksize:
+            yield texts, seen % chunksize, 1.0
+    finally:
+        workbook.close()
+
+def iter_feedback_chunks(fileobj, filename: str, chunksize: int = DEFAULT_CHUNK_SIZE):
+    """Stream a CSV/Excel upload as chunks of feedback texts.
+
+    Yields (texts, rows_read, fraction_done) with at most `chunksize` rows per
+    chunk, so memory stays flat however large the file is. Raises
+    MissingColumnError when the file has no 'feedback' or 'text' column.
+    """
+    if filename.endswith('.csv'):
+        return _iter_csv(fileobj, chunksize)
+    return _iter_xlsx(fileobj, chunksize)
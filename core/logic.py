@@ -1,66 +1,372 @@
 import pandas as pd
-from textblob import TextBlob
-import streamlit as st
 
-from .utils import create_feedback_hash, detect_language
+from . import chunking
+from .cache import CACHED_FIELDS
+from .metrics import timed
+from .session import AnalysisSession
+from .utils import create_feedback_hash, detect_language, detect_languages
 
-def analyze_sentiment(text: str, language: str, models: dict):
+DEFAULT_BATCH_SIZE = 32
+
+class MultilingualInference:
+    """One forward pass of the multilingual star-rating model.
+
+    The FAKE/GENUINE verdict and the star-based sentiment are both derived
+    from this single output, so each non-English review only runs the
+    model once.
+    """
+
+    def __init__(self, output: dict):
+        self.label = output['label']
+        self.score = output['score']
+
+    @classmethod
+    def run(cls, pipe, text: str):
+        return cls(chunking.classify(pipe, text))
+
+    @property
+    def rating(self) -> int:
+        return int(self.label[0])  # '1 star'..'5 stars' style
+
+    def authenticity(self):
+        classification = "FAKE" if self.score < 0.6 else "GENUINE"
+        return classification, self.score
+
+    def sentiment(self):
+        rating = self.rating
+        if rating >= 4:
+            return "POSITIVE", (rating-3)/2
+        elif rating <= 2:
+            return "NEGATIVE", (rating-3)/2
+        else:
+            return "NEUTRAL", 0.0
+
+def analyze_sentiment(text: str, language: str, models: dict, inference: MultilingualInference = None):
     if language == 'en':
+        from textblob import TextBlob
+
         blob = TextBlob(text)
         polarity = blob.sentiment.polarity
         sentiment_label = "POSITIVE" if polarity > 0.2 else "NEGATIVE" if polarity < -0.2 else "NEUTRAL"
-        return sentiment_label, f"{polarity:.2f}"
+        return sentiment_label, polarity
     else:
-        if models.get('multi') is None:
-            return "NEUTRAL", "0.00"
-        result = models['multi'](text)[0]
-        rating = int(result['label'][0])  # '1 star'..'5 stars' style
-        if rating >= 4:
-            return "POSITIVE", f"{(rating-3)/2:.2f}"
-        elif rating <= 2:
-            return "NEGATIVE", f"{(rating-3)/2:.2f}"
-        else:
-            return "NEUTRAL", "0.00"
+        if inference is None:
+            if models.get('multi') is None:
+                return "NEUTRAL", 0.0
+            inference = MultilingualInference.run(models['multi'], text)
+        return inference.sentiment()
+
+def _classify_english(auth_result: dict) -> str:
+    # Heuristic mapping: negative -> FAKE (as per your original logic)
+    return "FAKE" if auth_result['label'].lower() in ['negative', 'fake'] else "GENUINE"
+
+def _build_result(review_id: int, feedback: str, language: str, classification: str,
+                  confidence: float, sentiment_label: str, polarity: float) -> dict:
+    return {
+        "id": review_id,
+        "text": feedback,
+        "language": "Hindi" if language == 'hi' else "Telugu" if language == 'te' else "English",
+        "classification": classification,
+        "confidence": float(confidence),
+        "sentiment": sentiment_label,
+        "polarity": float(polarity),
+        "timestamp": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M")
+    }
 
-def analyze_feedback(feedback: str, selected_language: str = 'auto', models: dict = None):
+def _result_from_cache(review_id: int, feedback: str, cached: dict) -> dict:
+    return {
+        "id": review_id,
+        "text": feedback,
+        **cached,
+        "timestamp": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M")
+    }
+
+def _record_cluster(result: dict, near_duplicates, signature) -> dict:
+    # Reviews only join the index once they have a result, so every cluster
+    # id belongs to at least one stored review
+    if signature is not None:
+        cluster_id, _ = near_duplicates.add(signature)
+        result['cluster_id'] = cluster_id
+        near_duplicates.results.setdefault(cluster_id, {field: result[field] for field in CACHED_FIELDS})
+    return result
+
+def analyze_feedback(feedback: str, selected_language: str = 'auto', models: dict = None, cache=None,
+                     session=None, near_duplicates=None, reuse_clusters: bool = False, timings=None):
     if models is None:
         return None, "Models not loaded"
-    
-    feedback_hash = create_feedback_hash(feedback)
-    if feedback_hash in st.session_state.processed_hashes:
+    session = session if session is not None else AnalysisSession()
+
+    with timed(timings, "hash"):
+        feedback_hash = create_feedback_hash(feedback)
+    if feedback_hash in session.processed_hashes:
         return None, "This feedback has already been analyzed."
-    
+
+    signature = None
+    if near_duplicates is not None:
+        with timed(timings, "near_duplicates"):
+            signature = near_duplicates.signature(feedback)
+            cluster_id = near_duplicates.find(signature) if reuse_clusters else None
+        if cluster_id in near_duplicates.results:
+            session.processed_hashes.add(feedback_hash)
+            result = _result_from_cache(len(session.reviews) + 1, feedback, near_duplicates.results[cluster_id])
+            return _record_cluster(result, near_duplicates, signature), None
+
+    if cache is not None:
+        with timed(timings, "cache_lookup"):
+            cached = cache.get(feedback_hash, selected_language)
+        if cached is not None:
+            session.processed_hashes.add(feedback_hash)
+            result = _result_from_cache(len(session.reviews) + 1, feedback, cached)
+            return _record_cluster(result, near_duplicates, signature), None
+
     try:
-        language = detect_language(feedback) if selected_language == 'auto' else selected_language
-        
+        if selected_language == 'auto':
+            with timed(timings, "language_detect"):
+                language = detect_language(feedback)
+        else:
+            language = selected_language
+
         # Authenticity via classifier
         if language == 'en':
             if models.get('en') is None:
                 return None, "English analysis not available"
-            auth_result = models['en'](feedback)[0]
-            # Heuristic mapping: negative -> FAKE (as per your original logic)
-            classification = "FAKE" if auth_result['label'].lower() in ['negative', 'fake'] else "GENUINE"
+            with timed(timings, "model_en"):
+                auth_result = chunking.classify(models['en'], feedback)
+            classification = _classify_english(auth_result)
+            confidence = auth_result['score']
+            with timed(timings, "sentiment_en"):
+                sentiment_label, polarity = analyze_sentiment(feedback, language, models)
         else:
             if models.get('multi') is None:
                 return None, "Multilingual analysis not available"
-            auth_result = models['multi'](feedback)[0]
-            classification = "FAKE" if auth_result['score'] < 0.6 else "GENUINE"
-        
-        confidence = auth_result['score']
-        sentiment_label, polarity = analyze_sentiment(feedback, language, models)
-        
-        result = {
-            "id": len(st.session_state.reviews) + 1,
-            "text": feedback,
-            "language": "Hindi" if language == 'hi' else "Telugu" if language == 'te' else "English",
-            "classification": classification,
-            "confidence": f"{confidence:.0%}",
-            "sentiment": sentiment_label,
-            "polarity": polarity,
-            "timestamp": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M")
-        }
-        st.session_state.processed_hashes.add(feedback_hash)
-        return result, None
-        
+            with timed(timings, "model_multi"):
+                inference = MultilingualInference.run(models['multi'], feedback)
+            classification, confidence = inference.authenticity()
+            with timed(timings, "sentiment_multi"):
+                sentiment_label, polarity = analyze_sentiment(feedback, language, models, inference)
+
+        result = _build_result(len(session.reviews) + 1, feedback, language,
+                               classification, confidence, sentiment_label, polarity)
+        session.processed_hashes.add(feedback_hash)
+        if cache is not None:
+            with timed(timings, "cache_store"):
+                cache.put(feedback_hash, selected_language, result)
+        return _record_cluster(result, near_duplicates, signature), None
+
     except Exception as e:
         return None, f"Error analyzing feedback: {str(e)}"
+
+def _run_pipeline(pipe, texts: list, batch_size: int) -> list:
+    """Run `pipe` over `texts` in length-sorted batches.
+
+    Texts longer than the model's window are split into overlapping windows
+    (see core.chunking) that are batched together with the other texts and
+    aggregated back into one output per text. Returns one (output, error)
+    pair per text, in input order. A batch that fails is retried item by
+    item so one bad row only fails itself, exactly as in the per-row path.
+    """
+    windows, owners, weights = chunking.expand(pipe, texts)
+    order = sorted(range(len(windows)), key=lambda w: weights[w])
+    window_outputs = [None] * len(windows)
+    for start in range(0, len(order), batch_size):
+        chunk = order[start:start + batch_size]
+        try:
+            results = pipe([windows[w] for w in chunk], batch_size=batch_size, truncation=True)
+            for w, res in zip(chunk, results):
+                window_outputs[w] = (res, None)
+        except Exception:
+            for w in chunk:
+                try:
+                    window_outputs[w] = (pipe(windows[w], truncation=True)[0], None)
+                except Exception as e:
+                    window_outputs[w] = (None, f"Error analyzing feedback: {str(e)}")
+
+    per_text = [[] for _ in texts]
+    for w, i in enumerate(owners):
+        per_text[i].append(w)
+    outputs = []
+    for members in per_text:
+        error = next((window_outputs[w][1] for w in members if window_outputs[w][1]), None)
+        if error:
+            outputs.append((None, error))
+        else:
+            outputs.append((chunking.aggregate([window_outputs[w][0] for w in members],
+                                               [weights[w] for w in members]), None))
+    return outputs
+
+def analyze_texts(feedbacks: list, selected_language: str, models: dict,
+                  batch_size: int = DEFAULT_BATCH_SIZE, timings=None) -> list:
+    """Run language detection, authenticity and sentiment over `feedbacks`.
+
+    Stateless: no duplicate check, no cache, and results carry `id=None`.
+    Rows are grouped by language, sorted by token length and sent through
+    the pipelines `batch_size` at a time. Returns (result, error) pairs in
+    input order. Stage durations are added to `timings` when given.
+    """
+    outcomes = [None] * len(feedbacks)
+    if selected_language == 'auto':
+        languages = detect_languages(feedbacks, timings)
+    else:
+        languages = [selected_language] * len(feedbacks)
+
+    groups = {'en': [], 'multi': []}
+    for i, language in enumerate(languages):
+        if language == 'en':
+            if models.get('en') is None:
+                outcomes[i] = (None, "English analysis not available")
+            else:
+                groups['en'].append(i)
+        else:
+            if models.get('multi') is None:
+                outcomes[i] = (None, "Multilingual analysis not available")
+            else:
+                groups['multi'].append(i)
+
+    for key, indices in groups.items():
+        if not indices:
+            continue
+        with timed(timings, f"model_{key}", len(indices)):
+            outputs = _run_pipeline(models[key], [feedbacks[i] for i in indices], batch_size)
+        with timed(timings, f"sentiment_{key}", len(indices)):
+            for i, (auth_result, error) in zip(indices, outputs):
+                if error:
+                    outcomes[i] = (None, error)
+                    continue
+                feedback, language = feedbacks[i], languages[i]
+                try:
+                    if language == 'en':
+                        classification = _classify_english(auth_result)
+                        confidence = auth_result['score']
+                        sentiment_label, polarity = analyze_sentiment(feedback, language, models)
+                    else:
+                        inference = MultilingualInference(auth_result)
+                        classification, confidence = inference.authenticity()
+                        sentiment_label, polarity = inference.sentiment()
+                    outcomes[i] = (_build_result(None, feedback, language, classification,
+                                                 confidence, sentiment_label, polarity), None)
+                except Exception as e:
+                    outcomes[i] = (None, f"Error analyzing feedback: {str(e)}")
+    return outcomes
+
+class BatchPlan:
+    """Duplicate and cache bookkeeping around one batch of feedback texts.
+
+    Building the plan rejects texts already in `session`, folds repeated
+    texts onto their first occurrence and looks the rest up in `cache`;
+    `pending` lists the indices that still need the models. `commit` takes
+    the analysis of those indices and returns (result, error) pairs for the
+    whole batch, numbering results and recording them in the session and
+    the cache exactly like the per-row path.
+
+    With a `near_duplicates` index every text that gets a result is added
+    to it, and assigned a cluster id, in `commit`. With `reuse_clusters` as
+    well, texts whose cluster already has a result (from an earlier batch,
+    or an earlier row of this one) copy it instead of running the models.
+    """
+
+    def __init__(self, feedbacks: list, selected_language: str = 'auto', cache=None, session=None,
+                 near_duplicates=None, reuse_clusters: bool = False):
+        self.feedbacks = feedbacks
+        self.selected_language = selected_language
+        self.cache = cache
+        self.session = session if session is not None else AnalysisSession()
+        self.outcomes = [None] * len(feedbacks)
+        self.hashes = {}
+        self.duplicates = []
+        first_seen = {}
+        for i, feedback in enumerate(feedbacks):
+            feedback_hash = create_feedback_hash(feedback)
+            if feedback_hash in self.session.processed_hashes:
+                self.outcomes[i] = (None, "This feedback has already been analyzed.")
+            elif feedback_hash in first_seen:
+                self.duplicates.append((i, first_seen[feedback_hash]))
+            else:
+                first_seen[feedback_hash] = i
+                self.hashes[i] = feedback_hash
+
+        self.cached = {}
+        if cache is not None and self.hashes:
+            self.cached = cache.get_many(self.hashes.values(), selected_language)
+
+        self.near_duplicates = near_duplicates
+        self.signatures = {}
+        self.reused = {}
+        self.followers = {}
+        if near_duplicates is not None:
+            # Rows of this batch are grouped in a scratch index; the shared one
+            # only changes in `commit`, for rows that end up with a result
+            batch_index = near_duplicates.empty_like()
+            representatives = {}
+            for i in sorted(self.hashes):
+                signature = near_duplicates.signature(feedbacks[i])
+                self.signatures[i] = signature
+                if not reuse_clusters:
+                    continue
+                cluster_id = near_duplicates.find(signature)
+                if self.hashes[i] not in self.cached and cluster_id in near_duplicates.results:
+                    self.reused[i] = near_duplicates.results[cluster_id]
+                    continue
+                local_id, _ = batch_index.add(signature)
+                if self.hashes[i] in self.cached:
+                    representatives.setdefault(local_id, i)
+                elif local_id in representatives:
+                    self.followers[i] = representatives[local_id]
+                else:
+                    representatives[local_id] = i
+
+        self.pending = [i for i, h in self.hashes.items()
+                        if h not in self.cached and i not in self.reused and i not in self.followers]
+
+    def commit(self, analyzed: dict) -> list:
+        next_id = len(self.session.reviews) + 1
+        fresh = []
+        for i in sorted(self.hashes):
+            feedback, feedback_hash = self.feedbacks[i], self.hashes[i]
+            if feedback_hash in self.cached:
+                result = _result_from_cache(next_id, feedback, self.cached[feedback_hash])
+            elif i in self.reused:
+                result = _result_from_cache(next_id, feedback, self.reused[i])
+            elif i in self.followers:
+                # Representatives precede their followers, so their outcome is already known
+                representative, error = self.outcomes[self.followers[i]]
+                if representative is None:
+                    self.outcomes[i] = (None, error)
+                    continue
+                result = _result_from_cache(next_id, feedback,
+                                            {field: representative[field] for field in CACHED_FIELDS})
+            else:
+                result, error = analyzed[i]
+                if result is None:
+                    self.outcomes[i] = (None, error)
+                    continue
+                result['id'] = next_id
+                fresh.append((feedback_hash, result))
+            next_id += 1
+            self.session.processed_hashes.add(feedback_hash)
+            self.outcomes[i] = (_record_cluster(result, self.near_duplicates, self.signatures.get(i)), None)
+
+        if self.cache is not None and fresh:
+            self.cache.put_many(fresh, self.selected_language)
+
+        for i, original in self.duplicates:
+            result, error = self.outcomes[original]
+            self.outcomes[i] = (None, "This feedback has already been analyzed.") if result else (None, error)
+        return self.outcomes
+
+def analyze_feedback_batch(feedbacks, selected_language: str = 'auto', models: dict = None,
+                           batch_size: int = DEFAULT_BATCH_SIZE, cache=None, session=None,
+                           timings=None, near_duplicates=None, reuse_clusters: bool = False):
+    """Batched counterpart of `analyze_feedback` for a whole column of texts.
+
+    Returns a list of (result, error) pairs in the original order, with the
+    same values the per-row path produces. Rows found in `cache` skip the
+    pipelines entirely; see `BatchPlan` for near-duplicate clustering.
+    """
+    feedbacks = list(feedbacks)
+    if models is None:
+        return [(None, "Models not loaded")] * len(feedbacks)
+    with timed(timings, "dedupe_and_cache", len(feedbacks)):
+        plan = BatchPlan(feedbacks, selected_language, cache, session, near_duplicates, reuse_clusters)
+    analyzed = analyze_texts([feedbacks[i] for i in plan.pending], selected_language, models,
+                             batch_size, timings)
+    return plan.commit(dict(zip(plan.pending, analyzed)))
@@ -0,0 +1,192 @@
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+class StageTimings:
+    """Wall-clock seconds and item counts accumulated per named stage."""
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.items = defaultdict(int)
+
+    def add(self, stage: str, seconds: float, items: int = 1):
+        self.seconds[stage] += seconds
+        self.items[stage] += items
+
+    @contextmanager
+    def stage(self, name: str, items: int = 1):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started, items)
+
+    def summary(self) -> str:
+        return ", ".join(
+            f"{stage} {seconds:.2f}s/{self.items[stage]}"
+            for stage, seconds in sorted(self.seconds.items(), key=lambda kv: -kv[1])
+        )
+
+@contextmanager
+def timed(timings, stage: str, items: int = 1):
+    """`timings.stage(...)` that is a no-op when no timings are collected."""
+    if timings is None:
+        yield
+    else:
+        with timings.stage(stage, items):
+            yield
+
+class LatencyTracker:
+    """Sliding window of recent latencies (seconds) with percentile lookups."""
+
+    def __init__(self, window: int = 10000):
+        self._samples = deque(maxlen=window)
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self._samples.append(seconds)
+        self.count += 1
+
+    def percentile(self, q: float) -> float:
+        if not self._samples:
+            return float("nan")
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q / 100.0 * len(ordered)))]
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "p50_ms": self.percentile(50) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+        }
+
+def timed_iter(iterable, timings, stage: str):
+    """Yield from `iterable`, adding the time spent producing each item to `stage`."""
+    iterator = iter(iterable)
+    while True:
+        started = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        if timings is not None:
+            timings.add(stage, time.perf_counter() - started)
+        yield item
+
+# Seconds; spans a fast hash lookup up to a slow model batch
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus `le` semantics."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else float("nan")
+
+    def cumulative(self):
+        """(upper bound, observations <= bound) pairs, ending with +Inf."""
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            yield bound, total
+
+    def as_dict(self) -> dict:
+        return {"count": self.count, "sum": self.sum,
+                "buckets": {_format_bound(bound): total for bound, total in self.cumulative()}}
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+def _format_labels(labels, extra=()) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+class MetricsRegistry:
+    """Labelled counters, gauges and histograms with Prometheus/JSON export.
+
+    Metrics are created on first use: `inc("errors_total", reason="...")`,
+    `set("rows_per_second", 120.0)`, `observe("stage_seconds", 0.02,
+    stage="model_en")`. `record_timings` folds a StageTimings in.
+    """
+
+    def __init__(self, prefix: str = "feedback_"):
+        self.prefix = prefix
+        self.reset()
+
+    def reset(self):
+        self.counters = defaultdict(float)
+        self.gauges = {}
+        self.histograms = {}
+
+    @staticmethod
+    def _key(name: str, labels: dict):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels):
+        self.counters[self._key(name, labels)] += value
+
+    def set(self, name: str, value: float, **labels):
+        self.gauges[self._key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels):
+        key = self._key(name, labels)
+        if key not in self.histograms:
+            self.histograms[key] = Histogram()
+        self.histograms[key].observe(value)
+
+    def record_timings(self, timings: StageTimings):
+        """Per-item latency of every stage, plus running totals."""
+        for stage, seconds in timings.seconds.items():
+            items = timings.items[stage]
+            self.observe("stage_seconds_per_item", seconds / max(items, 1), stage=stage)
+            self.inc("stage_seconds_total", seconds, stage=stage)
+            self.inc("stage_items_total", items, stage=stage)
+
+    def counter(self, name: str, **labels) -> float:
+        return self.counters.get(self._key(name, labels), 0.0)
+
+    def labelled(self, kind: dict, name: str) -> dict:
+        """{labels: value} for every series of `name` in `kind`."""
+        return {labels: value for (metric, labels), value in kind.items() if metric == name}
+
+    def to_prometheus(self) -> str:
+        lines = []
+        for kind, series in (("counter", self.counters), ("gauge", self.gauges)):
+            for name in sorted({name for name, _ in series}):
+                lines.append(f"# TYPE {self.prefix}{name} {kind}")
+                for labels, value in sorted(self.labelled(series, name).items()):
+                    lines.append(f"{self.prefix}{name}{_format_labels(labels)} {value:g}")
+        for name in sorted({name for name, _ in self.histograms}):
+            full = self.prefix + name
+            lines.append(f"# TYPE {full} histogram")
+            for labels, histogram in sorted(self.labelled(self.histograms, name).items()):
+                for bound, total in histogram.cumulative():
+                    lines.append(f"{full}_bucket{_format_labels(labels, [('le', _format_bound(bound))])} {total}")
+                lines.append(f"{full}_sum{_format_labels(labels)} {histogram.sum:g}")
+                lines.append(f"{full}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def as_dict(self) -> dict:
+        def series(kind, export=lambda value: value):
+            return [{"name": name, "labels": dict(labels), "value": export(value)}
+                    for (name, labels), value in sorted(kind.items(), key=lambda kv: kv[0])]
+        return {
+            "counters": series(self.counters),
+            "gauges": series(self.gauges),
+            "histograms": series(self.histograms, Histogram.as_dict),
+        }
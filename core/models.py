@@ -1,28 +1,124 @@
-import streamlit as st
-import torch
-from transformers import pipeline
-
-@st.cache_resource
-def load_models():
-    model_dict = {}
-    try:
-        model_dict['en'] = pipeline(
-            "text-classification",
-            model="distilbert-base-uncased-finetuned-sst-2-english",
-            device=0 if torch.cuda.is_available() else -1
-        )
-    except Exception as e:
-        st.error(f"Error loading English model: {str(e)}")
-        model_dict['en'] = None
-    
-    try:
-        model_dict['multi'] = pipeline(
+import logging
+import os
+import threading
+import time
+from collections.abc import Mapping
+
+from .chunking import MAX_WINDOWS, WINDOW_OVERLAP
+
+EN_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+MULTI_MODEL = "nlptown/bert-base-multilingual-uncased-sentiment"
+# Bump whenever the models or the result mapping change, so cached results are not reused
+MODEL_REVISION = f"{EN_MODEL}|{MULTI_MODEL}|v3"
+
+# 'torch': fp32 PyTorch (default); 'torch-int8': dynamic int8 quantization of
+# the Linear layers (CPU only); 'onnx': ONNX Runtime on an exported graph
+# (needs `optimum[onnxruntime]`).
+BACKENDS = ('torch', 'torch-int8', 'onnx')
+DEFAULT_BACKEND = os.environ.get("MODEL_BACKEND", "torch")
+ONNX_EXPORT_DIR = os.environ.get("ONNX_EXPORT_DIR", os.path.join(".cache", "onnx"))
+
+logger = logging.getLogger(__name__)
+
+def model_revision(backend: str = DEFAULT_BACKEND) -> str:
+    # The window settings change verdicts for long reviews, and int8/ONNX
+    # scores can drift slightly from fp32, so both are part of the cache key
+    revision = f"{MODEL_REVISION}|windows={WINDOW_OVERLAP}/{MAX_WINDOWS}"
+    return revision if backend == 'torch' else f"{revision}|{backend}"
+
+def _load_onnx_model(model_name: str):
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+
+    export_dir = os.path.join(ONNX_EXPORT_DIR, model_name.replace("/", "--"))
+    if os.path.isdir(export_dir):
+        return ORTModelForSequenceClassification.from_pretrained(export_dir)
+    model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+    model.save_pretrained(export_dir)
+    return model
+
+def build_pipeline(model_name: str, backend: str = DEFAULT_BACKEND):
+    """A text-classification pipeline for `model_name` on the given backend.
+
+    Every backend returns a transformers pipeline, so callers (and
+    `analyze_feedback`) do not need to know which one is in use.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', use one of: {', '.join(BACKENDS)}")
+    # torch/transformers take seconds to import; only pay for it when a model is built
+    import torch
+    from transformers import pipeline
+
+    if backend == 'torch':
+        return pipeline(
             "text-classification",
-            model="nlptown/bert-base-multilingual-uncased-sentiment",
+            model=model_name,
             device=0 if torch.cuda.is_available() else -1
         )
-    except Exception as e:
-        st.error(f"Error loading multilingual model: {str(e)}")
-        model_dict['multi'] = None
-    
-    return model_dict
+
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    if backend == 'torch-int8':
+        model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    else:
+        model = _load_onnx_model(model_name)
+    return pipeline("text-classification", model=model, tokenizer=tokenizer, device=-1)
+
+_MODEL_NAMES = {'en': EN_MODEL, 'multi': MULTI_MODEL}
+_MODEL_LABELS = {'en': "English", 'multi': "multilingual"}
+
+class LazyModels(Mapping):
+    """The {'en': ..., 'multi': ...} model dict, building each pipeline on first use.
+
+    A model that fails to load maps to None, like in `load_models`. Load
+    failures are also kept in `errors` and load durations in
+    `load_seconds`, so a UI can report them after a background warm-up.
+    `model_names` overrides the checkpoint per key, e.g. a local directory
+    with a small stand-in model for offline benchmarks.
+    """
+
+    def __init__(self, backend: str = DEFAULT_BACKEND, on_error=None, model_names: dict = None):
+        self.backend = backend
+        self.model_names = {**_MODEL_NAMES, **(model_names or {})}
+        self.errors = []
+        self.load_seconds = {}
+        self._on_error = on_error or logger.error
+        self._models = {}
+        self._locks = {key: threading.Lock() for key in _MODEL_NAMES}
+
+    def __getitem__(self, key):
+        if key not in self._models:
+            with self._locks[key]:
+                if key not in self._models:
+                    started = time.perf_counter()
+                    try:
+                        self._models[key] = build_pipeline(self.model_names[key], self.backend)
+                    except Exception as e:
+                        message = f"Error loading {_MODEL_LABELS[key]} model: {str(e)}"
+                        self.errors.append(message)
+                        self._on_error(message)
+                        self._models[key] = None
+                    self.load_seconds[key] = time.perf_counter() - started
+        return self._models[key]
+
+    def __iter__(self):
+        return iter(_MODEL_NAMES)
+
+    def __len__(self):
+        return len(_MODEL_NAMES)
+
+    def warm_in_background(self, keys=('en', 'multi')) -> threading.Thread:
+        """Start loading `keys` in a daemon thread; first use waits for it."""
+        thread = threading.Thread(target=lambda: [self[key] for key in keys],
+                                  name="model-warmup", daemon=True)
+        thread.start()
+        return thread
+
+def load_models(on_error=None, backend: str = DEFAULT_BACKEND):
+    """Build the English and multilingual pipelines.
+
+    A model that fails to load is set to None and reported through
+    `on_error` (the Streamlit app passes `st.error`), or logged otherwise.
+    """
+    return dict(LazyModels(backend, on_error).items())
@@ -0,0 +1,84 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .logic import DEFAULT_BATCH_SIZE, BatchPlan, analyze_texts
+
+_worker_models = None
+
+def _init_worker(threads: int, backend: str):
+    global _worker_models
+    import torch
+
+    from .models import load_models
+
+    # Each worker gets a fixed slice of the cores instead of every worker
+    # spinning up one torch thread per core.
+    torch.set_num_threads(threads)
+    _worker_models = load_models(backend=backend)
+
+def _ping(delay: float) -> int:
+    time.sleep(delay)
+    return os.getpid()
+
+def _analyze_shard(task):
+    texts, selected_language, batch_size = task
+    return analyze_texts(texts, selected_language, _worker_models, batch_size)
+
+class ParallelAnalyzer:
+    """Shard batch analysis across a pool of worker processes.
+
+    Every worker loads the pipelines once and keeps them for the life of the
+    pool, so create one analyzer and reuse it across batches. Duplicate and
+    cache handling stay in the calling process; results come back in input
+    order with the same values as `analyze_feedback_batch`.
+    """
+
+    def __init__(self, workers: int = None, threads_per_worker: int = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, backend: str = None):
+        from .models import DEFAULT_BACKEND
+
+        cores = os.cpu_count() or 1
+        self.workers = workers or cores
+        self.threads_per_worker = threads_per_worker or max(1, cores // self.workers)
+        self.batch_size = batch_size
+        self.backend = backend or DEFAULT_BACKEND
+        # spawn: forking a parent that already holds torch thread pools can deadlock
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker, self.backend),
+        )
+
+    def warm_up(self):
+        """Block until every worker has loaded its models."""
+        # Workers only take tasks once their initializer is done; the short
+        # sleep stops one ready worker from answering every ping.
+        ready = set()
+        while len(ready) < self.workers:
+            ready.update(self._pool.map(_ping, [0.1] * self.workers))
+
+    def analyze_batch(self, feedbacks, selected_language: str = 'auto', cache=None, session=None,
+                      near_duplicates=None, reuse_clusters: bool = False) -> list:
+        feedbacks = list(feedbacks)
+        plan = BatchPlan(feedbacks, selected_language, cache, session, near_duplicates, reuse_clusters)
+        pending = plan.pending
+        # A few shards per worker keeps the pool busy when shards finish unevenly
+        shard_size = max(self.batch_size, -(-len(pending) // (self.workers * 4)))
+        shards = [pending[start:start + shard_size] for start in range(0, len(pending), shard_size)]
+        tasks = [([feedbacks[i] for i in shard], selected_language, self.batch_size) for shard in shards]
+        analyzed = {}
+        for shard, outcomes in zip(shards, self._pool.map(_analyze_shard, tasks)):
+            analyzed.update(zip(shard, outcomes))
+        return plan.commit(analyzed)
+
+    def close(self):
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,80 @@
+import sqlite3
+import uuid
+
+import streamlit as st
+
+from .cache import ResultCache
+from .dedupe import NearDuplicateIndex
+from .history import ReviewHistory, history_path, prune_histories, restore_session
+from .metrics import MetricsRegistry
+from .models import LazyModels
+from .store import ReviewStore
+
+# Streamlit glue: everything under core/ other than this module and styles.py
+# runs without Streamlit (see core/cli.py).
+
+def ensure_session_state():
+    if 'near_duplicates' not in st.session_state:
+        st.session_state.near_duplicates = NearDuplicateIndex()
+    if 'reviews' not in st.session_state:
+        try:
+            # Reload what earlier runs analyzed, and keep appending to it
+            st.session_state.reviews, st.session_state.processed_hashes = restore_session(
+                get_review_history(), st.session_state.near_duplicates)
+        except (sqlite3.Error, OSError) as e:
+            st.warning(f"Review history disabled: {str(e)}")
+            st.session_state.near_duplicates.clear()
+            st.session_state.reviews = ReviewStore()
+            st.session_state.processed_hashes = set()
+    if 'processed_hashes' not in st.session_state:
+        st.session_state.processed_hashes = set()
+    if 'chart_cache' not in st.session_state:
+        st.session_state.chart_cache = {}
+    if 'diagnostics' not in st.session_state:
+        st.session_state.diagnostics = MetricsRegistry()
+
+@st.cache_resource
+def get_models():
+    # Models build on first use; warming starts now so the first analysis
+    # rarely has to wait, while the page renders immediately.
+    models = LazyModels()
+    models.warm_in_background()
+    return models
+
+@st.cache_resource
+def get_result_cache():
+    try:
+        return ResultCache()
+    except Exception as e:
+        st.warning(f"Result cache disabled: {str(e)}")
+        return None
+
+# Query parameter naming this session's history file. It survives a refresh or
+# server restart; a tab opened without it starts an empty history.
+HISTORY_PARAM = "history"
+
+def get_review_history():
+    """This session's ReviewHistory.
+
+    Each session writes its own file, so one user's "Reset All Data" never
+    touches another's reviews and ids and duplicate checks stay per session.
+    """
+    prune_old_histories()
+    token = st.query_params.get(HISTORY_PARAM)
+    try:
+        path = history_path(token)
+    except (TypeError, ValueError):
+        token = uuid.uuid4().hex
+        st.query_params[HISTORY_PARAM] = token
+        path = history_path(token)
+    # Cheap: the file is only created when this session first stores a review
+    return ReviewHistory(path)
+
+@st.cache_resource
+def prune_old_histories():
+    # Once per server process; see REVIEW_HISTORY_RETENTION_DAYS
+    try:
+        return prune_histories()
+    except OSError as e:
+        st.warning(f"Could not prune old review histories: {str(e)}")
+        return 0
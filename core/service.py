@@ -0,0 +1,269 @@
+"""Local HTTP analysis service with dynamic micro-batching.
+
+    python -m core.service --port 8080 --max-batch-size 32 --max-wait-ms 10
+
+POST /analyze with {"text": "...", "language": "auto"} or {"texts": [...]};
+GET /stats for queue depth, batch sizes and p50/p99 latency; GET /health.
+A full queue answers 503 with Retry-After so callers back off.
+"""
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .logic import DEFAULT_BATCH_SIZE, _result_from_cache, analyze_texts
+from .metrics import LatencyTracker
+from .models import BACKENDS, DEFAULT_BACKEND
+from .utils import create_feedback_hash
+
+LANGUAGE_CHOICES = ('auto', 'en', 'hi', 'te')
+
+class QueueFullError(Exception):
+    pass
+
+class MicroBatcher:
+    """Collects concurrent requests into batches for one pipeline call.
+
+    A batch is dispatched when it reaches `max_batch_size` or when its
+    oldest request has waited `max_wait_ms`, whichever comes first.
+    Inference runs on a single worker thread so the event loop keeps
+    accepting requests while a batch is in flight, and the next batch fills
+    up meanwhile. `enqueue` raises QueueFullError once `max_queue` requests
+    are waiting.
+    """
+
+    def __init__(self, models: dict, max_batch_size: int = DEFAULT_BATCH_SIZE, max_wait_ms: float = 10.0,
+                 max_queue: int = 1024, cache=None):
+        self.models = models
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.cache = cache
+        self.latency = LatencyTracker()
+        self.batches = 0
+        self.batched_items = 0
+        self._queue = asyncio.Queue(maxsize=max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+        self._executor.shutdown(wait=False)
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def capacity(self) -> int:
+        return self._queue.maxsize
+
+    def has_room(self, count: int = 1) -> bool:
+        return self._queue.maxsize - self._queue.qsize() >= count
+
+    def enqueue(self, texts: list, language: str = 'auto') -> list:
+        """Queue all `texts` or none of them; returns one future per text.
+
+        Nothing here awaits, so no other request can take the capacity
+        between the check and the puts.
+        """
+        if not self.has_room(len(texts)):
+            raise QueueFullError("Analysis queue is full, retry later")
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._queue.put_nowait((text, language, future, time.perf_counter()))
+            futures.append(future)
+        return futures
+
+    async def _next_batch(self):
+        batch = [await self._queue.get()]
+        deadline = batch[0][3] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            try:
+                outcomes = await loop.run_in_executor(self._executor, self._analyze, batch)
+            except Exception as e:
+                outcomes = [(None, f"Error analyzing feedback: {str(e)}")] * len(batch)
+            finished = time.perf_counter()
+            self.batches += 1
+            self.batched_items += len(batch)
+            for (_, _, future, enqueued), outcome in zip(batch, outcomes):
+                self.latency.observe(finished - enqueued)
+                if not future.done():
+                    future.set_result(outcome)
+
+    def _analyze(self, batch) -> list:
+        outcomes = [None] * len(batch)
+        by_language = {}
+        for i, (text, language, _, _) in enumerate(batch):
+            by_language.setdefault(language, []).append(i)
+        for language, indices in by_language.items():
+            texts = [batch[i][0] for i in indices]
+            hashes = [create_feedback_hash(text) for text in texts]
+            cached = self.cache.get_many(hashes, language) if self.cache is not None else {}
+            misses = [k for k, h in enumerate(hashes) if h not in cached]
+            analyzed = analyze_texts([texts[k] for k in misses], language, self.models, self.max_batch_size)
+            fresh = dict(zip(misses, analyzed))
+            for k, i in enumerate(indices):
+                if hashes[k] in cached:
+                    result = _result_from_cache(None, texts[k], cached[hashes[k]])
+                    result.pop("id")
+                    outcomes[i] = (result, None)
+                    continue
+                result, error = fresh[k]
+                if result is not None:
+                    result.pop("id", None)
+                    if self.cache is not None:
+                        self.cache.put(hashes[k], language, result)
+                outcomes[i] = (result, error)
+        return outcomes
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.depth,
+            "batches": self.batches,
+            "mean_batch_size": self.batched_items / self.batches if self.batches else 0.0,
+            "latency": self.latency.summary(),
+        }
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 503: "Service Unavailable"}
+
+class AnalysisService:
+    """Minimal HTTP/1.1 front end (stdlib asyncio only) for a MicroBatcher."""
+
+    def __init__(self, batcher: MicroBatcher, max_body_bytes: int = 1024 * 1024):
+        self.batcher = batcher
+        self.max_body_bytes = max_body_bytes
+
+    async def _respond(self, writer, status: int, payload: dict, headers: dict = None):
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        lines = [f"HTTP/1.1 {status} {_REASONS[status]}", "Content-Type: application/json",
+                 f"Content-Length: {len(body)}"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+        await writer.drain()
+
+    async def _analyze(self, payload: dict):
+        language = payload.get("language", "auto")
+        if language not in LANGUAGE_CHOICES:
+            return 400, {"error": f"language must be one of {', '.join(LANGUAGE_CHOICES)}"}
+        texts = payload.get("texts", [payload.get("text")] if "text" in payload else None)
+        if not isinstance(texts, list) or not texts or \
+                not all(isinstance(text, str) and text.strip() for text in texts):
+            return 400, {"error": "Send a non-empty 'text' string or 'texts' list of strings"}
+        if len(texts) > self.batcher.capacity:
+            # Could never fit, even in an empty queue, so retrying cannot help
+            return 413, {"error": f"At most {self.batcher.capacity} texts per request"}
+        # All or nothing, so a rejected request leaves no orphaned work queued
+        try:
+            futures = self.batcher.enqueue(texts, language)
+        except QueueFullError as e:
+            return 503, {"error": str(e)}
+        outcomes = await asyncio.gather(*futures)
+        results = [{"result": result, "error": error} for result, error in outcomes]
+        return 200, results[0] if "texts" not in payload else {"results": results}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = (await reader.readline()).decode("latin-1").strip()
+                    if not line:
+                        break
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > self.max_body_bytes:
+                    await self._respond(writer, 413, {"error": "Request body too large"})
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                extra = {}
+                if path == "/health":
+                    status, payload = 200, {"status": "ok"}
+                elif path == "/stats":
+                    status, payload = 200, self.batcher.stats()
+                elif path != "/analyze":
+                    status, payload = 404, {"error": "Not found"}
+                elif method != "POST":
+                    status, payload = 405, {"error": "Use POST"}
+                else:
+                    try:
+                        status, payload = await self._analyze(json.loads(body or b"{}"))
+                    except QueueFullError as e:
+                        status, payload = 503, {"error": str(e)}
+                    except (ValueError, AttributeError):
+                        status, payload = 400, {"error": "Body must be a JSON object"}
+                    if status == 503:
+                        extra["Retry-After"] = "1"
+                await self._respond(writer, status, payload, extra)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+async def serve(host: str, port: int, batcher: MicroBatcher):
+    batcher.start()
+    service = AnalysisService(batcher)
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"Serving on http://{host}:{port}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.service", description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=10.0)
+    parser.add_argument("--max-queue", type=int, default=1024, help="Waiting requests before answering 503")
+    parser.add_argument("--backend", choices=BACKENDS, default=DEFAULT_BACKEND)
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args(argv)
+
+    from .cache import ResultCache
+    from .models import load_models, model_revision
+
+    models = load_models(backend=args.backend)
+    cache = None if args.no_cache else ResultCache(revision=model_revision(args.backend))
+
+    async def run():
+        batcher = MicroBatcher(models, args.max_batch_size, args.max_wait_ms, args.max_queue, cache)
+        await serve(args.host, args.port, batcher)
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
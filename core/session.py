@@ -0,0 +1,16 @@
+from .store import ReviewStore
+
+class AnalysisSession:
+    """Reviews analyzed so far and the hashes used to reject duplicates.
+
+    `st.session_state` has the same two attributes, so the Streamlit app
+    passes it directly; headless callers create one of these instead.
+    """
+
+    def __init__(self):
+        self.reviews = ReviewStore()
+        self.processed_hashes = set()
+
+    def reset(self):
+        self.reviews = ReviewStore()
+        self.processed_hashes = set()
@@ -0,0 +1,202 @@
+import numpy as np
+
+from .aggregates import ReviewAggregates
+
+LANGUAGES = ("English", "Hindi", "Telugu")
+CLASSIFICATIONS = ("GENUINE", "FAKE")
+SENTIMENTS = ("POSITIVE", "NEUTRAL", "NEGATIVE")
+
+# Categorical columns are stored as int8 codes into these tuples
+CATEGORIES = {
+    "language": LANGUAGES,
+    "classification": CLASSIFICATIONS,
+    "sentiment": SENTIMENTS,
+}
+COLUMNS = ("id", "text", "language", "classification", "confidence", "sentiment", "polarity", "timestamp",
+           "cluster_id")
+# Stored for reviews analyzed without a near-duplicate index
+NO_CLUSTER = -1
+
+def _stored_cluster_id(result: dict) -> int:
+    cluster_id = result.get("cluster_id")
+    return NO_CLUSTER if cluster_id is None else cluster_id
+
+def format_confidence(value: float) -> str:
+    return f"{value:.0%}"
+
+def format_polarity(value: float) -> str:
+    return f"{value:.2f}"
+
+def format_timestamp(value) -> str:
+    return str(np.datetime_as_string(value, unit='m')).replace('T', ' ')
+
+class _IndexArray:
+    """Append-only, sorted array of row numbers (one per category value)."""
+
+    def __init__(self, capacity: int = 256):
+        self._rows = np.empty(capacity, np.int64)
+        self._size = 0
+
+    def extend(self, rows):
+        needed = self._size + len(rows)
+        if needed > len(self._rows):
+            grown = np.empty(max(needed, 2 * len(self._rows)), np.int64)
+            grown[:self._size] = self._rows[:self._size]
+            self._rows = grown
+        self._rows[self._size:needed] = rows
+        self._size = needed
+
+    def view(self):
+        return self._rows[:self._size]
+
+class ReviewStore:
+    """Analyzed reviews kept as typed columns instead of a list of dicts.
+
+    Confidence and polarity are float32, language/classification/sentiment
+    are int8 category codes and timestamps are datetime64. Columns grow by
+    doubling, and `column()` returns read-only views of the filled part, so
+    readers never copy. Values are only formatted for display (see the
+    `format_*` helpers).
+
+    Each categorical value also keeps a sorted array of the rows that have
+    it, so `select()` answers filter combinations by intersecting indexes
+    instead of scanning every review. `version` changes on every write and
+    can be used as a cache key for anything derived from the store, and
+    `stats` holds running aggregates for the insights metrics. With a
+    `history` attached (see core.history) every write is also persisted.
+    """
+
+    _DTYPES = {
+        "id": np.int64,
+        "language": np.int8,
+        "classification": np.int8,
+        "confidence": np.float32,
+        "sentiment": np.int8,
+        "polarity": np.float32,
+        "timestamp": "datetime64[m]",
+        "cluster_id": np.int64,
+    }
+
+    def __init__(self, capacity: int = 1024):
+        self._size = 0
+        self._text = []
+        self._columns = {name: np.empty(capacity, dtype) for name, dtype in self._DTYPES.items()}
+        self._codes = {name: {value: code for code, value in enumerate(values)}
+                       for name, values in CATEGORIES.items()}
+        self._indexes = {name: [_IndexArray() for _ in values] for name, values in CATEGORIES.items()}
+        self.stats = ReviewAggregates(CATEGORIES)
+        self.version = 0
+        self.history = None
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def _reserve(self, extra: int):
+        capacity = len(self._columns["id"])
+        if self._size + extra <= capacity:
+            return
+        while capacity < self._size + extra:
+            capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def append(self, result: dict):
+        self.extend([result])
+
+    def extend(self, results):
+        results = list(results)
+        if not results:
+            return
+        self._reserve(len(results))
+        start, stop = self._size, self._size + len(results)
+        for name in self._DTYPES:
+            # Unclustered reviews may carry no cluster_id, or None (e.g. from history)
+            values = [_stored_cluster_id(result) if name == "cluster_id" else result[name]
+                      for result in results]
+            if name in self._codes:
+                values = [self._codes[name][value] for value in values]
+            self._columns[name][start:stop] = values
+        for name, indexes in self._indexes.items():
+            codes = self._columns[name][start:stop]
+            for code, index in enumerate(indexes):
+                rows = np.flatnonzero(codes == code)
+                if len(rows):
+                    index.extend(rows + start)
+        self.stats.update(*(self._columns[name][start:stop]
+                            for name in ("classification", "sentiment", "language", "confidence")))
+        texts = [result["text"] for result in results]
+        self.stats.add_texts(self._columns["classification"][start:stop], texts)
+        self._text.extend(texts)
+        self._size = stop
+        self.version += 1
+        if self.history is not None:
+            self.history.append(results)
+
+    def clear(self):
+        self._size = 0
+        self._text = []
+        self._indexes = {name: [_IndexArray() for _ in values] for name, values in CATEGORIES.items()}
+        self.stats.reset()
+        self.version += 1
+        if self.history is not None:
+            self.history.clear()
+
+    def column(self, name: str):
+        """Read-only view of a column; categorical columns return their codes."""
+        if name == "text":
+            return self._text
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def code(self, name: str, value: str) -> int:
+        return self._codes[name][value]
+
+    def select(self, **filters) -> np.ndarray:
+        """Sorted row numbers matching every `field=value` filter.
+
+        None or "All" leaves a field unfiltered, e.g.
+        `store.select(classification="FAKE", language="All")`.
+        """
+        matches = [
+            self._indexes[field][self._codes[field][value]].view()
+            for field, value in filters.items()
+            if value not in (None, "All")
+        ]
+        if not matches:
+            return np.arange(self._size)
+        matches.sort(key=len)
+        rows = matches[0]
+        for other in matches[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+
+    def row(self, index: int) -> dict:
+        row = {}
+        for name in COLUMNS:
+            if name == "text":
+                row[name] = self._text[index]
+            elif name in CATEGORIES:
+                row[name] = CATEGORIES[name][self._columns[name][index]]
+            elif name == "timestamp":
+                row[name] = format_timestamp(self._columns[name][index])
+            elif name == "cluster_id":
+                cluster_id = self._columns[name][index].item()
+                row[name] = None if cluster_id == NO_CLUSTER else cluster_id
+            elif name in ("confidence", "polarity"):
+                # Shortest decimal of the float32, e.g. 0.9 rather than 0.8999999761581421
+                row[name] = float(str(self._columns[name][index]))
+            else:
+                row[name] = self._columns[name][index].item()
+        return row
+
+    def rows(self, indices=None):
+        for index in range(self._size) if indices is None else indices:
+            yield self.row(int(index))
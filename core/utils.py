@@ -1,30 +1,60 @@
-import streamlit as st
 import hashlib
-import nltk
+import re
+import time
+
 from langdetect import detect, DetectorFactory
 
-# Initialize NLTK & langdetect only once
-@st.cache_resource
-def _init_nlp_resources():
-    nltk.download('punkt')
-    nltk.download('stopwords')
-    DetectorFactory.seed = 0
-    return True
+# Deterministic langdetect results. No NLTK corpora are needed: TextBlob's
+# default sentiment analyzer does not use punkt or stopwords.
+DetectorFactory.seed = 0
 
-_init_nlp_resources()
+_DEVANAGARI = re.compile(r'[\u0900-\u097F]')
+_TELUGU = re.compile(r'[\u0C00-\u0C7F]')
+_LATIN = re.compile(r'[A-Za-z\u00C0-\u024F]')
 
-def ensure_session_state():
-    if 'reviews' not in st.session_state:
-        st.session_state.reviews = []
-    if 'processed_hashes' not in st.session_state:
-        st.session_state.processed_hashes = set()
+# Share of Devanagari/Telugu letters (against Latin ones) above which the
+# script alone decides the language.
+SCRIPT_DOMINANCE = 0.5
 
 def create_feedback_hash(feedback: str) -> str:
     return hashlib.md5(feedback.encode()).hexdigest()
 
-def detect_language(text: str) -> str:
+def _langdetect(text: str) -> str:
     try:
         lang = detect(text)
         return 'hi' if lang == 'hi' else 'te' if lang == 'te' else 'en'
     except Exception:
         return 'en'
+
+def _route_by_script(text: str):
+    devanagari = len(_DEVANAGARI.findall(text))
+    telugu = len(_TELUGU.findall(text))
+    indic = devanagari + telugu
+    if indic == 0:
+        # langdetect maps every non-Hindi/Telugu answer to 'en' anyway
+        return 'en'
+    if indic / (indic + len(_LATIN.findall(text))) >= SCRIPT_DOMINANCE:
+        return 'hi' if devanagari >= telugu else 'te'
+    return None
+
+def detect_languages(texts, timings=None) -> list:
+    """Route a batch of texts to 'en', 'hi' or 'te'.
+
+    Each text is first classified by a histogram of its Devanagari, Telugu
+    and Latin letters; only mixed-script text where Latin dominates is sent
+    to langdetect. Pass a `core.metrics.StageTimings` as `timings` to see
+    the time split between the two stages.
+    """
+    started = time.perf_counter()
+    languages = [_route_by_script(text) for text in texts]
+    ambiguous = [i for i, language in enumerate(languages) if language is None]
+    routed = time.perf_counter()
+    for i in ambiguous:
+        languages[i] = _langdetect(texts[i])
+    if timings is not None:
+        timings.add('language_script', routed - started, len(languages))
+        timings.add('language_langdetect', time.perf_counter() - routed, len(ambiguous))
+    return languages
+
+def detect_language(text: str) -> str:
+    return detect_languages([text])[0]